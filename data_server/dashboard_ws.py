@@ -3,48 +3,80 @@
 WebSocket broadcast system for real-time dashboard updates.
 Dashboards connect to /ws/dashboard and receive events when data changes.
 """
-import json
 import asyncio
+import time
 from aiohttp import web
-from typing import Set
+from typing import Tuple, Union
 from weakref import WeakSet
 
-# Connected dashboard clients
-_dashboard_clients: Set[web.WebSocketResponse] = set()
-_lock = asyncio.Lock()
+import orjson
+
+from database.db import Call, LocationPoint
+
+# Connected dashboard clients. Connects and disconnects swap in a new tuple
+# (copy-on-write), so broadcasts can iterate the current one without a lock or copy
+_dashboard_clients: Tuple[web.WebSocketResponse, ...] = ()
+
+SEND_TIMEOUT = 2.0  # Seconds a dashboard may take to accept a broadcast before it is dropped
+
+
+def dumps_text(obj) -> str:
+    """Encode a message with orjson; dashboards expect text frames, so decode to str.
+
+    orjson serializes dataclasses natively, so Call / LocationPoint records can
+    be broadcast as they are instead of being copied into dicts first.
+    """
+    return orjson.dumps(obj).decode()
+
+
+def _add_client(ws: web.WebSocketResponse):
+    global _dashboard_clients
+    _dashboard_clients = _dashboard_clients + (ws,)
+
+
+def _remove_clients(*dropped: web.WebSocketResponse):
+    global _dashboard_clients
+    _dashboard_clients = tuple(ws for ws in _dashboard_clients if ws not in dropped)
+
+
+async def send_to_client(ws: web.WebSocketResponse, message: str, label: str = "Dashboard WS") -> bool:
+    """Send one encoded message to a client; False if the client should be dropped."""
+    try:
+        if not ws.closed:
+            await asyncio.wait_for(ws.send_str(message), SEND_TIMEOUT)
+        return True
+    except asyncio.TimeoutError:
+        # The write may have been cut off mid-frame, so close the connection;
+        # the dashboard reconnects and gets a clean stream
+        print(f"[{label}] Client too slow (>{SEND_TIMEOUT}s), disconnecting")
+        asyncio.create_task(ws.close())
+        return False
+    except Exception as e:
+        print(f"[{label}] Error sending to client: {e}")
+        return False
 
 
 async def broadcast_event(event_type: str, data: dict):
     """Broadcast an event to all connected dashboard clients."""
-    if not _dashboard_clients:
+    clients = _dashboard_clients
+    if not clients:
         return
 
-    message = json.dumps({
+    message = dumps_text({
         "type": event_type,
         "data": data
     })
 
-    # Copy set to avoid modification during iteration
-    async with _lock:
-        clients = list(_dashboard_clients)
-
-    disconnected = []
-    for ws in clients:
-        try:
-            if not ws.closed:
-                await ws.send_str(message)
-        except Exception as e:
-            print(f"[Dashboard WS] Error sending to client: {e}")
-            disconnected.append(ws)
+    # Send to every client at once so one slow dashboard doesn't delay the rest
+    results = await asyncio.gather(*(send_to_client(ws, message) for ws in clients))
+    disconnected = [ws for ws, ok in zip(clients, results) if not ok]
 
     # Remove disconnected clients
     if disconnected:
-        async with _lock:
-            for ws in disconnected:
-                _dashboard_clients.discard(ws)
+        _remove_clients(*disconnected)
 
 
-async def broadcast_new_call(user_id: str, call_data: dict):
+async def broadcast_new_call(user_id: str, call_data: Union[Call, dict]):
     """Broadcast when a new emergency call is saved."""
     await broadcast_event("new_call", {
         "user_id": user_id,
@@ -53,7 +85,7 @@ async def broadcast_new_call(user_id: str, call_data: dict):
     print(f"[Dashboard WS] Broadcasted new_call for {user_id}")
 
 
-async def broadcast_new_location(user_id: str, location_data: dict):
+async def broadcast_new_location(user_id: str, location_data: Union[LocationPoint, dict]):
     """Broadcast when a new location is saved."""
     await broadcast_event("new_location", {
         "user_id": user_id,
@@ -93,7 +125,7 @@ async def broadcast_status_change(user_id: str, role: str, old_status: str, new_
         "old_status": old_status,
         "new_status": new_status,
         "reason": reason,
-        "timestamp": asyncio.get_event_loop().time()
+        "timestamp": time.time()
     })
     print(f"[Dashboard WS] Broadcasted status_changed: {user_id} ({role}): {old_status} → {new_status} (reason: {reason})")
 
@@ -104,8 +136,7 @@ async def dashboard_ws_handler(request):
     await ws.prepare(request)
 
     # Register this client
-    async with _lock:
-        _dashboard_clients.add(ws)
+    _add_client(ws)
 
     client_count = len(_dashboard_clients)
     print(f"[Dashboard WS] Client connected. Total clients: {client_count}")
@@ -118,7 +149,7 @@ async def dashboard_ws_handler(request):
                 "message": "Connected to dashboard updates",
                 "clients": client_count
             }
-        })
+        }, dumps=dumps_text)
     except Exception:
         pass
 
@@ -127,9 +158,9 @@ async def dashboard_ws_handler(request):
             if msg.type == web.WSMsgType.TEXT:
                 # Handle ping/pong or other client messages
                 try:
-                    data = json.loads(msg.data)
+                    data = orjson.loads(msg.data)
                     if data.get("type") == "ping":
-                        await ws.send_json({"type": "pong"})
+                        await ws.send_json({"type": "pong"}, dumps=dumps_text)
                 except Exception:
                     pass
             elif msg.type == web.WSMsgType.ERROR:
@@ -137,8 +168,7 @@ async def dashboard_ws_handler(request):
                 break
     finally:
         # Unregister this client
-        async with _lock:
-            _dashboard_clients.discard(ws)
+        _remove_clients(ws)
         print(f"[Dashboard WS] Client disconnected. Total clients: {len(_dashboard_clients)}")
 
     return ws
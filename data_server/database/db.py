@@ -9,7 +9,7 @@ from pathlib import Path
 DATA_ROOT = Path(__file__).parent.parent / "data"
 
 
-@dataclass
+@dataclass(slots=True)
 class LocationPoint:
     lat: float
     lon: float
@@ -17,7 +17,7 @@ class LocationPoint:
     accuracy: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Call:
     call_id: str
     transcript: str
@@ -26,7 +26,7 @@ class Call:
     tags: List[str] = field(default_factory=list)  # Top 3 meaningful words extracted from transcript
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     user_id: str
     role: Literal["civilian", "first_responder"]
@@ -37,7 +37,7 @@ class User:
     calls: List[Call] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsArticle:
     article_id: str
     link: str
@@ -50,7 +50,7 @@ class NewsArticle:
     lon: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SensorReading:
     reading_id: str
     status: int
@@ -67,13 +67,13 @@ class SensorReading:
     received_at: float
 
 
-@dataclass
+@dataclass(slots=True)
 class DangerZoneVertex:
     lat: float
     lon: float
 
 
-@dataclass
+@dataclass(slots=True)
 class DangerZone:
     zone_id: str
     category: Literal["natural", "people", "infrastructure"]
@@ -89,7 +89,7 @@ class DangerZone:
     recommended_action: str = ""  # evacuate, shelter_in_place, avoid_area
 
 
-@dataclass
+@dataclass(slots=True)
 class Hospital:
     hospital_id: str
     name: str
@@ -107,7 +107,7 @@ class Hospital:
     last_updated: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedEntity:
     entity_id: str
     source_type: Literal["call", "news", "sensor"]
@@ -1,23 +1,35 @@
 #!/usr/bin/env python3
 import json
 import time
-import uuid
+import secrets
 import asyncio
 from aiohttp import web
-from typing import Set
+from typing import Tuple
+
+import orjson
 
 from database.postgres import save_news, list_news, list_extracted_entities, list_danger_zones
 from database.db import NewsArticle
-from dashboard_ws import broadcast_new_news
+from dashboard_ws import broadcast_new_news, dumps_text, send_to_client
 from danger_extractor import extract_danger_from_news
 
 
-# Connected danger zone WebSocket clients
-_danger_zone_clients: Set[web.WebSocketResponse] = set()
-_danger_zone_lock = asyncio.Lock()
+# Connected danger zone WebSocket clients, swapped copy-on-write like the
+# dashboard clients so the once-a-second broadcast needs no lock or copy
+_danger_zone_clients: Tuple[web.WebSocketResponse, ...] = ()
 _broadcast_task = None
 
 
+def _add_danger_zone_client(ws: web.WebSocketResponse):
+    global _danger_zone_clients
+    _danger_zone_clients = _danger_zone_clients + (ws,)
+
+
+def _remove_danger_zone_clients(*dropped: web.WebSocketResponse):
+    global _danger_zone_clients
+    _danger_zone_clients = tuple(ws for ws in _danger_zone_clients if ws not in dropped)
+
+
 async def print_news_table():
     news = await list_news()
     print(f"\n=== NEWS ARTICLES TABLE ({len(news)} articles) ===")
@@ -54,7 +66,7 @@ async def news_information_in(request):
 
     # Create and save news article
     article = NewsArticle(
-        article_id=uuid.uuid4().hex,
+        article_id=secrets.token_hex(16),
         link=link,
         title=title,
         pub_date=pub_date,
@@ -132,30 +144,23 @@ async def _broadcast_danger_zones_loop():
 
             # Fetch current danger zones
             zones = await list_danger_zones()
-            message = json.dumps({
+            message = dumps_text({
                 "type": "danger_zones",
                 "timestamp": time.time(),
                 "danger_zones": zones
             })
 
-            # Broadcast to all connected clients
-            async with _danger_zone_lock:
-                clients = list(_danger_zone_clients)
-
-            disconnected = []
-            for ws in clients:
-                try:
-                    if not ws.closed:
-                        await ws.send_str(message)
-                except Exception as e:
-                    print(f"[DangerZones WS] Error sending to client: {e}")
-                    disconnected.append(ws)
+            # Send to every client at once, dropping slow or failed ones,
+            # the same way dashboard broadcasts do
+            clients = _danger_zone_clients
+            results = await asyncio.gather(
+                *(send_to_client(ws, message, "DangerZones WS") for ws in clients)
+            )
+            disconnected = [ws for ws, ok in zip(clients, results) if not ok]
 
             # Remove disconnected clients
             if disconnected:
-                async with _danger_zone_lock:
-                    for ws in disconnected:
-                        _danger_zone_clients.discard(ws)
+                _remove_danger_zone_clients(*disconnected)
 
         except Exception as e:
             print(f"[DangerZones WS] Broadcast loop error: {e}")
@@ -174,8 +179,7 @@ async def danger_zones_ws_handler(request):
         print("[DangerZones WS] Started broadcast loop")
 
     # Register this client
-    async with _danger_zone_lock:
-        _danger_zone_clients.add(ws)
+    _add_danger_zone_client(ws)
 
     client_count = len(_danger_zone_clients)
     print(f"[DangerZones WS] Client connected. Total clients: {client_count}")
@@ -187,7 +191,7 @@ async def danger_zones_ws_handler(request):
             "type": "danger_zones",
             "timestamp": time.time(),
             "danger_zones": zones
-        })
+        }, dumps=dumps_text)
     except Exception as e:
         print(f"[DangerZones WS] Error sending initial data: {e}")
 
@@ -196,9 +200,9 @@ async def danger_zones_ws_handler(request):
             if msg.type == web.WSMsgType.TEXT:
                 # Handle ping/pong
                 try:
-                    data = json.loads(msg.data)
+                    data = orjson.loads(msg.data)
                     if data.get("type") == "ping":
-                        await ws.send_json({"type": "pong"})
+                        await ws.send_json({"type": "pong"}, dumps=dumps_text)
                 except Exception:
                     pass
             elif msg.type == web.WSMsgType.ERROR:
@@ -206,8 +210,7 @@ async def danger_zones_ws_handler(request):
                 break
     finally:
         # Unregister this client
-        async with _danger_zone_lock:
-            _danger_zone_clients.discard(ws)
+        _remove_danger_zone_clients(ws)
         print(f"[DangerZones WS] Client disconnected. Total clients: {len(_danger_zone_clients)}")
 
     return ws
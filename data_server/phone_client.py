@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
-import json
+import os
 import time
-import uuid
+import zlib
+import secrets
 import asyncio
 from aiohttp import web
 
+import orjson
+
 from database.postgres import ensure_user_exists, append_location, append_call, list_users, get_user
 from database.db import LocationPoint, Call
 from dashboard_ws import broadcast_new_call, broadcast_new_location
@@ -12,34 +15,93 @@ from tag_extractor import extract_bilingual_tags
 from danger_extractor import extract_danger_from_call
 from status_inference import infer_civilian_status, infer_responder_status
 
+# Set PHONE_VERBOSE=1 to log every transcript chunk, batch and saved location
+VERBOSE = os.getenv("PHONE_VERBOSE") == "1"
+
+# Without PHONE_VERBOSE, per-location lines are only printed for a fixed
+# 1-in-8 sample of users (by CRC32 of user_id, stable across restarts); the
+# ingest totals count the rest
+LOG_SAMPLE_MASK = 0x7
+
+# Set PHONE_DUMP_USERS=1 to print the whole users table after each batch/call.
+# Debug only: it reloads every user's full history from the database each time
+DUMP_USERS_TABLE = os.getenv("PHONE_DUMP_USERS") == "1"
+
+# Status inference to run after a location update, keyed by user role
+STATUS_INFERENCE_BY_ROLE = {
+    "civilian": infer_civilian_status,
+    "first_responder": infer_responder_status,
+}
+
+# orjson parses str and bytes alike, so phones may send JSON as text or as
+# binary frames; binary skips aiohttp's UTF-8 decode into a str
+FRAME_TYPES = (web.WSMsgType.TEXT, web.WSMsgType.BINARY)
+
+# A burst of updates for one user (e.g. a batch of location fixes) only needs
+# one status inference run once the burst has landed
+INFERENCE_DEBOUNCE = 0.25
+_inference_pending = set()
+
+# Running totals for this server process, updated as each message is saved
+_ingest_totals = {"locations": 0, "calls": 0}
+_users_seen = set()
+
+
+def should_log_user(user_id: str) -> bool:
+    """Whether per-message lines for this user should be printed."""
+    return VERBOSE or (zlib.crc32(user_id.encode()) & LOG_SAMPLE_MASK) == 0
+
+
+def record_ingest(user_id: str, kind: str):
+    """Count a saved location or call towards the running totals."""
+    _users_seen.add(user_id)
+    _ingest_totals[kind] += 1
+
+
+def schedule_status_inference(user_id: str, infer_status):
+    """Schedule status inference for a user unless a run is already queued."""
+    if user_id in _inference_pending:
+        return
+    _inference_pending.add(user_id)
+    asyncio.create_task(_run_status_inference(user_id, infer_status))
+
+
+async def _run_status_inference(user_id: str, infer_status):
+    await asyncio.sleep(INFERENCE_DEBOUNCE)
+    # Updates arriving from here on queue a fresh run that will see them
+    _inference_pending.discard(user_id)
+    await infer_status(user_id)
+
 
 async def process_location_message(user_id: str, data: dict):
     """Process a single location message."""
     await ensure_user_exists(user_id)
+
+    # Phones stamp their own fixes; only read the clock when they did not
+    timestamp = data.get("timestamp")
+    if timestamp is None:
+        timestamp = time.time()
+
     location = LocationPoint(
         lat=data.get("lat"),
         lon=data.get("lon"),
-        timestamp=data.get("timestamp", time.time()),
+        timestamp=timestamp,
         accuracy=data.get("accuracy", 0.0),
     )
     await append_location(user_id, location)
-    print(f"Location saved for {user_id}: {location}")
+    record_ingest(user_id, "locations")
+    if should_log_user(user_id):
+        print(f"Location saved for {user_id}: {location}")
 
     # Broadcast to dashboards
-    await broadcast_new_location(user_id, {
-        "lat": location.lat,
-        "lon": location.lon,
-        "timestamp": location.timestamp,
-        "accuracy": location.accuracy,
-    })
+    await broadcast_new_location(user_id, location)
 
     # Trigger status inference for both roles
     user = await get_user(user_id)
     if user:
-        if user.role == 'civilian':
-            asyncio.create_task(infer_civilian_status(user_id))
-        elif user.role == 'first_responder':
-            asyncio.create_task(infer_responder_status(user_id))
+        infer_status = STATUS_INFERENCE_BY_ROLE.get(user.role)
+        if infer_status is not None:
+            schedule_status_inference(user_id, infer_status)
 
 
 async def process_transcript_message(user_id: str, transcript_data: dict, call_start_time: float, partial_texts: list):
@@ -58,23 +120,18 @@ async def process_transcript_message(user_id: str, transcript_data: dict, call_s
         tags = extract_bilingual_tags(text, num_tags=3)
 
         call = Call(
-            call_id=uuid.uuid4().hex,
+            call_id=secrets.token_hex(16),
             transcript=text,
             start_time=call_start_time,
             end_time=time.time(),
             tags=tags
         )
         await append_call(user_id, call)
+        record_ingest(user_id, "calls")
         print(f"Call saved for user {user_id} with tags: {tags}")
 
         # Broadcast to dashboards
-        await broadcast_new_call(user_id, {
-            "call_id": call.call_id,
-            "transcript": call.transcript,
-            "start_time": call.start_time,
-            "end_time": call.end_time,
-            "tags": call.tags
-        })
+        await broadcast_new_call(user_id, call)
 
         # Extract danger zone in background (don't block response)
         asyncio.create_task(
@@ -82,23 +139,33 @@ async def process_transcript_message(user_id: str, transcript_data: dict, call_s
         )
 
         # Trigger status inference (civilian only, as calls are from civilians)
-        asyncio.create_task(infer_civilian_status(user_id))
+        schedule_status_inference(user_id, infer_civilian_status)
 
         return True, call
     else:
         # Store partial text in case of sudden disconnect
         partial_texts.append(text)
-        print(f"Transcript chunk received for {user_id}: {text[:50]}...")
+        if VERBOSE:
+            print(f"Transcript chunk received for {user_id}: {text[:50]}...")
         return False, None
 
 
 async def print_users_table():
     users = await list_users()
     print(f"\n=== USERS TABLE ({len(users)} users) ===")
-    print(json.dumps(users, indent=2, default=str))
+    print(orjson.dumps(users, default=str, option=orjson.OPT_INDENT_2).decode())
     print("=" * 40)
 
 
+async def print_ingest_summary():
+    """Print the running ingest totals, or the full users table when PHONE_DUMP_USERS=1."""
+    if DUMP_USERS_TABLE:
+        await print_users_table()
+    else:
+        print(f"=== INGESTED: {len(_users_seen)} users, {_ingest_totals['locations']} locations, "
+              f"{_ingest_totals['calls']} calls ===")
+
+
 async def phone_transcript_ws(request):
     ws = web.WebSocketResponse()
     await ws.prepare(request)
@@ -108,16 +175,17 @@ async def phone_transcript_ws(request):
     partial_texts = []  # Collect texts in case of sudden disconnect
 
     async for msg in ws:
-        if msg.type == web.WSMsgType.TEXT:
+        if msg.type in FRAME_TYPES:
             try:
-                data = json.loads(msg.data)
+                data = orjson.loads(msg.data)
             except Exception:
                 data = None
 
             # Handle both single messages and batch arrays
             if isinstance(data, list):
                 messages = data
-                print(f"Processing batch of {len(messages)} transcript messages")
+                if VERBOSE:
+                    print(f"Processing batch of {len(messages)} transcript messages")
             elif isinstance(data, dict):
                 messages = [data]
             else:
@@ -143,7 +211,7 @@ async def phone_transcript_ws(request):
                     )
 
                     if is_final:
-                        await print_users_table()
+                        await print_ingest_summary()
                         await ws.close()
                         return ws
 
@@ -151,8 +219,6 @@ async def phone_transcript_ws(request):
                     print(f"Error processing transcript message: {e}")
                     continue
 
-        elif msg.type == web.WSMsgType.BINARY:
-            pass
         elif msg.type == web.WSMsgType.ERROR:
             break
 
@@ -165,29 +231,24 @@ async def phone_transcript_ws(request):
         tags = extract_bilingual_tags(full_transcript, num_tags=3)
 
         call = Call(
-            call_id=uuid.uuid4().hex,
+            call_id=secrets.token_hex(16),
             transcript=full_transcript,
             start_time=call_start_time,
             end_time=time.time(),
             tags=tags
         )
         await append_call(user_id, call)
+        record_ingest(user_id, "calls")
         print(f"Call saved on disconnect for user {user_id} with tags: {tags}")
-        await print_users_table()
+        await print_ingest_summary()
         # Broadcast to dashboards
-        await broadcast_new_call(user_id, {
-            "call_id": call.call_id,
-            "transcript": call.transcript,
-            "start_time": call.start_time,
-            "end_time": call.end_time,
-            "tags": call.tags
-        })
+        await broadcast_new_call(user_id, call)
         # Extract danger zone in background (don't block response)
         asyncio.create_task(
             extract_danger_from_call(call.call_id, full_transcript, user_id)
         )
         # Trigger status inference (civilian only, as calls are from civilians)
-        asyncio.create_task(infer_civilian_status(user_id))
+        schedule_status_inference(user_id, infer_civilian_status)
 
     return ws
 
@@ -197,16 +258,17 @@ async def phone_location_ws(request):
     await ws.prepare(request)
 
     async for msg in ws:
-        if msg.type == web.WSMsgType.TEXT:
+        if msg.type in FRAME_TYPES:
             try:
-                data = json.loads(msg.data)
+                data = orjson.loads(msg.data)
             except Exception:
                 data = None
 
             # Handle both single messages and batch arrays
             if isinstance(data, list):
                 messages = data
-                print(f"Processing batch of {len(messages)} location messages")
+                if VERBOSE:
+                    print(f"Processing batch of {len(messages)} location messages")
             elif isinstance(data, dict):
                 messages = [data]
             else:
@@ -228,10 +290,8 @@ async def phone_location_ws(request):
                     continue
 
             # Print users table after processing batch
-            await print_users_table()
+            await print_ingest_summary()
 
-        elif msg.type == web.WSMsgType.BINARY:
-            pass
         elif msg.type == web.WSMsgType.ERROR:
             break
 
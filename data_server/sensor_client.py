@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import json
 import time
-import uuid
+import secrets
 from aiohttp import web
 
 from database.postgres import save_sensor_reading, list_sensor_readings
@@ -33,7 +33,7 @@ async def sensor_data_in(request):
     mic = data.get("mic", {})
 
     reading = SensorReading(
-        reading_id=uuid.uuid4().hex,
+        reading_id=secrets.token_hex(16),
         status=data.get("status", 0),
         temperature=data.get("temperature", 0.0),
         humidity=data.get("humidity", 0.0),
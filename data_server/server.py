@@ -3,6 +3,12 @@ import asyncio
 import os
 from aiohttp import web
 
+# libuv-based event loop: optional; listed in requirements.txt
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from news_client import register_news_routes
 from phone_client import register_phone_routes
 from sensor_client import register_sensor_routes
@@ -90,4 +96,6 @@ def create_app():
 
 
 if __name__ == "__main__":
-    web.run_app(create_app(), host=HOST, port=PORT)
+    # run_app creates a stock asyncio loop when loop is None
+    loop = uvloop.new_event_loop() if uvloop else None
+    web.run_app(create_app(), host=HOST, port=PORT, loop=loop)
@@ -23,6 +23,11 @@ MEDICAL_KEYWORDS = {
     'tr': ['kanama', 'baygın', 'kalp', 'nefes', 'göğüs', 'ağrı', 'kırık', 'yanık']
 }
 
+# The checks don't care which language matched, so scan one flat tuple per list
+ALL_PRIORITY_KEYWORDS = tuple(k for keywords in PRIORITY_KEYWORDS.values() for k in keywords)
+ALL_MEDICAL_KEYWORDS = tuple(k for keywords in MEDICAL_KEYWORDS.values() for k in keywords)
+MULTIPLE_VICTIM_INDICATORS = ('people', 'victims', 'injured', 'kişi', 'yaralı', '2', '3', '4', '5')
+
 
 async def get_active_assignment(user_id: str, role: str) -> Optional[dict]:
     """
@@ -143,24 +148,20 @@ async def calculate_priority_score(user_id: str) -> int:
     # Get latest call
     latest_call = user.calls[-1]
     transcript = latest_call.transcript.lower()
-    tags = [tag.lower() for tag in latest_call.tags] if latest_call.tags else []
+    tags = {tag.lower() for tag in latest_call.tags} if latest_call.tags else set()
 
     # Check medical keywords in transcript and tags
     medical_count = 0
-    for lang_keywords in MEDICAL_KEYWORDS.values():
-        for keyword in lang_keywords:
-            if keyword in transcript or keyword in tags:
-                medical_count += 1
-                if medical_count >= 2:  # Cap at 2 keywords
-                    break
-        if medical_count >= 2:
-            break
+    for keyword in ALL_MEDICAL_KEYWORDS:
+        if keyword in transcript or keyword in tags:
+            medical_count += 1
+            if medical_count >= 2:  # Cap at 2 keywords
+                break
 
     score += min(medical_count * 15, 30)
 
     # Check for multiple victims (numbers or "people")
-    multiple_victim_indicators = ['people', 'victims', 'injured', 'kişi', 'yaralı', '2', '3', '4', '5']
-    if any(indicator in transcript or indicator in tags for indicator in multiple_victim_indicators):
+    if any(indicator in transcript or indicator in tags for indicator in MULTIPLE_VICTIM_INDICATORS):
         score += 10
 
     # Time freshness (decays over 1 hour)
@@ -208,15 +209,11 @@ async def infer_civilian_status(user_id: str) -> Optional[str]:
     # Rule 1: normal → needs_help (priority keywords in latest call)
     if current_status == 'normal' and user.calls:
         latest_call = user.calls[-1]
-        tags = [tag.lower() for tag in latest_call.tags] if latest_call.tags else []
+        tags = {tag.lower() for tag in latest_call.tags} if latest_call.tags else set()
         transcript = latest_call.transcript.lower()
 
         # Check for priority keywords
-        has_priority = False
-        for lang_keywords in PRIORITY_KEYWORDS.values():
-            if any(keyword in transcript or keyword in tags for keyword in lang_keywords):
-                has_priority = True
-                break
+        has_priority = any(keyword in transcript or keyword in tags for keyword in ALL_PRIORITY_KEYWORDS)
 
         if has_priority:
             await update_user_status(user_id, 'needs_help', 'priority_keywords_detected')
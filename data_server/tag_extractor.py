@@ -6,7 +6,8 @@ Supports both English and Turkish languages.
 """
 
 import re
-from typing import List
+from typing import List, Tuple
+from functools import lru_cache
 from collections import Counter
 
 try:
@@ -46,6 +47,19 @@ PRIORITY_KEYWORDS = {
     'hastane', 'göçük', 'yıkım', 'enkaz', 'kayıp', 'ölü', 'can', 'kırık'
 }
 
+# Language detection hints for extract_bilingual_tags
+TURKISH_CHARS = frozenset('ğüşıöçĞÜŞİÖÇ')
+TURKISH_WORD_INDICATORS = ('bir', 've', 'için', 'bu', 'de', 'da', 'ile')
+
+# Punctuation stripped before tokenizing
+NON_WORD_RE = re.compile(r'[^\w\s]')
+
+# Number of recent transcripts whose tags are kept in memory
+TAG_CACHE_SIZE = 1024
+
+# NLTK English stopwords, loaded once on first use
+_english_stopwords = None
+
 
 def download_nltk_resources():
     """Download required NLTK resources if not already present."""
@@ -68,6 +82,17 @@ def download_nltk_resources():
     return True
 
 
+def get_english_stopwords() -> set:
+    """Return the NLTK English stopword set, reading the corpus only once."""
+    global _english_stopwords
+    if _english_stopwords is None:
+        try:
+            _english_stopwords = set(stopwords.words('english'))
+        except:
+            return set()
+    return _english_stopwords
+
+
 def extract_tags(transcript: str, language: str = "en", num_tags: int = 3) -> List[str]:
     """
     Extract the top N most meaningful words from a transcript.
@@ -89,7 +114,7 @@ def extract_tags(transcript: str, language: str = "en", num_tags: int = 3) -> Li
 
     # Convert to lowercase and remove special characters
     text = transcript.lower()
-    text = re.sub(r'[^\w\s]', ' ', text)
+    text = NON_WORD_RE.sub(' ', text)
 
     # Tokenize
     try:
@@ -102,10 +127,7 @@ def extract_tags(transcript: str, language: str = "en", num_tags: int = 3) -> Li
     if language == 'tr':
         stop_words = TURKISH_STOPWORDS
     else:
-        try:
-            stop_words = set(stopwords.words('english'))
-        except:
-            stop_words = set()
+        stop_words = get_english_stopwords()
 
     # Filter out stopwords and short words
     meaningful_words = [
@@ -121,23 +143,20 @@ def extract_tags(transcript: str, language: str = "en", num_tags: int = 3) -> Li
             # Keep nouns (NN*), verbs (VB*), and priority keywords
             meaningful_words = [
                 word for word, pos in pos_tagged
-                if pos.startswith('NN') or pos.startswith('VB') or word in PRIORITY_KEYWORDS
+                if pos.startswith(('NN', 'VB')) or word in PRIORITY_KEYWORDS
             ]
         except:
             pass  # If POS tagging fails, use all meaningful words
 
     # Score words based on frequency and priority
-    word_scores = Counter()
-
-    for word in meaningful_words:
-        # Base score is frequency
-        score = meaningful_words.count(word)
+    # Base score is frequency, counted in one pass (keys keep first-seen order,
+    # so ties in most_common still go to the earliest word)
+    word_scores = Counter(meaningful_words)
 
+    for word in word_scores:
         # Boost score if word is in priority keywords
         if word in PRIORITY_KEYWORDS:
-            score *= 3
-
-        word_scores[word] = score
+            word_scores[word] *= 3
 
     # Get top N words
     top_words = [word for word, _ in word_scores.most_common(num_tags)]
@@ -168,22 +187,28 @@ def extract_bilingual_tags(transcript: str, num_tags: int = 3) -> List[str]:
     if not transcript:
         return []
 
-    # Count Turkish-specific characters to detect language
-    turkish_chars = set('ğüşıöçĞÜŞİÖÇ')
-    turkish_char_count = sum(1 for char in transcript if char in turkish_chars)
+    # Each caller gets its own list; the cached tuple stays untouched
+    return list(_cached_bilingual_tags(transcript, num_tags))
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def _cached_bilingual_tags(transcript: str, num_tags: int) -> Tuple[str, ...]:
+    # Look for Turkish-specific characters to detect language (set scan in C,
+    # stops at the first hit)
+    has_turkish_chars = not TURKISH_CHARS.isdisjoint(transcript)
 
     # Also check for Turkish words
-    turkish_word_indicators = ['bir', 've', 'için', 'bu', 'de', 'da', 'ile']
-    turkish_word_count = sum(1 for word in turkish_word_indicators if word in transcript.lower())
+    text_lower = transcript.lower()
+    turkish_word_count = sum(1 for word in TURKISH_WORD_INDICATORS if word in text_lower)
 
     # Determine language (simple heuristic)
     # >= 1 Turkish char or >= 2 Turkish indicator words suggests Turkish
-    if turkish_char_count >= 1 or turkish_word_count >= 2:
+    if has_turkish_chars or turkish_word_count >= 2:
         language = 'tr'
     else:
         language = 'en'
 
-    return extract_tags(transcript, language, num_tags)
+    return tuple(extract_tags(transcript, language, num_tags))
 
 
 # Initialize NLTK resources when module is imported
@@ -3,10 +3,19 @@
 Convert news.xml RSS feed to JSON format.
 """
 
-import xml.etree.ElementTree as ET
 import json
 from datetime import datetime
 
+from rss_xml import ET
+
+FEED_FIELDS = ('title', 'link', 'description', 'language', 'lastBuildDate', 'generator')
+ITEM_FIELDS = ('title', 'link', 'guid', 'pubDate', 'description')
+
+def _text(parent, tag):
+    """Text of the first child with the given tag, or '' if missing."""
+    el = parent.find(tag)
+    return el.text if el is not None else ''
+
 def parse_news_xml(xml_file, output_file):
     """Parse XML RSS feed and convert to JSON format."""
 
@@ -20,26 +29,14 @@ def parse_news_xml(xml_file, output_file):
         return
 
     # Extract channel information
-    feed_info = {
-        'title': channel.find('title').text if channel.find('title') is not None else '',
-        'link': channel.find('link').text if channel.find('link') is not None else '',
-        'description': channel.find('description').text if channel.find('description') is not None else '',
-        'language': channel.find('language').text if channel.find('language') is not None else '',
-        'lastBuildDate': channel.find('lastBuildDate').text if channel.find('lastBuildDate') is not None else '',
-        'generator': channel.find('generator').text if channel.find('generator') is not None else ''
-    }
+    feed_info = {field: _text(channel, field) for field in FEED_FIELDS}
 
     # Extract news items
     items = []
-    for item in channel.findall('item'):
-        news_item = {
-            'title': item.find('title').text if item.find('title') is not None else '',
-            'link': item.find('link').text if item.find('link') is not None else '',
-            'guid': item.find('guid').text if item.find('guid') is not None else '',
-            'pubDate': item.find('pubDate').text if item.find('pubDate') is not None else '',
-            'description': item.find('description').text if item.find('description') is not None else '',
-            'source': item.find('source').get('url') if item.find('source') is not None else ''
-        }
+    for item in channel.iterfind('item'):
+        news_item = {field: _text(item, field) for field in ITEM_FIELDS}
+        source = item.find('source')
+        news_item['source'] = source.get('url') if source is not None else ''
         items.append(news_item)
 
     # Create final JSON structure
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Shared de-duplication helpers for the news fetch/processing scripts.
+"""
+
+
+def ensure_uniqueness(items, log_duplicates=False):
+    """Remove duplicate items based on title, link, or guid.
+
+    Each identifier type has its own seen set, so a title that happens to
+    equal another item's guid is not treated as a duplicate. With
+    log_duplicates, each removed item is printed with the identifier that matched.
+    """
+    seen_titles = set()
+    seen_links = set()
+    seen_guids = set()
+    unique_items = []
+
+    # Bind hot-loop methods to locals to skip attribute lookups per item
+    add_title = seen_titles.add
+    add_link = seen_links.add
+    add_guid = seen_guids.add
+    append = unique_items.append
+
+    for item in items:
+        title = (item.get('title') or '').strip().lower()
+        link = (item.get('link') or '').strip()
+        guid = (item.get('guid') or '').strip()
+
+        if ((title and title in seen_titles)
+                or (link and link in seen_links)
+                or (guid and guid in seen_guids)):
+            if log_duplicates:
+                if title and title in seen_titles:
+                    id_type, id_value = 'title', title
+                elif link and link in seen_links:
+                    id_type, id_value = 'link', link
+                else:
+                    id_type, id_value = 'guid', guid
+                print(f"Removing duplicate item with {id_type}: {id_value[:100]}...")
+            continue
+
+        if title:
+            add_title(title)
+        if link:
+            add_link(link)
+        if guid:
+            add_guid(guid)
+        append(item)
+
+    return unique_items
@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
-import json
 import random
 from datetime import datetime, timedelta
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import os
-import glob
+
+import orjson
+
+from dedup import ensure_uniqueness
+from pubdate import sort_by_pub_date
+from rss_xml import ET, stream_rss, list_xml_files
 
 def load_news_json(file_path):
     """Load and parse the news.json file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with open(file_path, 'rb') as f:
+        return orjson.loads(f.read())
 
 def generate_random_events():
     """Generate random news events with random pubDates"""
@@ -63,37 +65,6 @@ def generate_random_events():
 
     return random_events
 
-def ensure_uniqueness(items):
-    """Remove duplicate items based on title, link, or guid"""
-    seen = set()
-    unique_items = []
-
-    for item in items:
-        # Create a unique identifier based on title, link, or guid
-        identifiers = []
-        if 'title' in item and item['title']:
-            identifiers.append(('title', item['title'].strip().lower()))
-        if 'link' in item and item['link']:
-            identifiers.append(('link', item['link'].strip()))
-        if 'guid' in item and item['guid']:
-            identifiers.append(('guid', item['guid'].strip()))
-
-        # Check if any identifier has been seen before
-        is_duplicate = False
-        for id_type, id_value in identifiers:
-            if id_value in seen:
-                print(f"Removing duplicate item with {id_type}: {id_value[:100]}...")
-                is_duplicate = True
-                break
-
-        if not is_duplicate:
-            # Add all identifiers to seen set
-            for id_type, id_value in identifiers:
-                seen.add(id_value)
-            unique_items.append(item)
-
-    return unique_items
-
 def extend_news_json(news_data, random_events):
     """Add random events to the news data and ensure uniqueness"""
     # Combine all items
@@ -101,19 +72,13 @@ def extend_news_json(news_data, random_events):
 
     # Remove duplicates
     print(f"Checking {len(all_items)} items for duplicates...")
-    unique_items = ensure_uniqueness(all_items)
+    unique_items = ensure_uniqueness(all_items, log_duplicates=True)
     print(f"Kept {len(unique_items)} unique items (removed {len(all_items) - len(unique_items)} duplicates)")
 
     news_data["items"] = unique_items
 
     # Sort all items by pubDate
-    def parse_date(item):
-        try:
-            return datetime.strptime(item["pubDate"], "%a, %d %b %Y %H:%M:%S GMT")
-        except:
-            return datetime.min
-
-    news_data["items"].sort(key=parse_date, reverse=True)
+    sort_by_pub_date(news_data["items"])
     return news_data
 
 def parse_xml_file(file_path):
@@ -125,7 +90,7 @@ def parse_xml_file(file_path):
         items = []
 
         # Find all item elements
-        for item in root.iter('item'):
+        for item in root.iterfind('.//item'):
             item_data = {}
 
             # Extract basic fields
@@ -156,7 +121,7 @@ def parse_xml_file(file_path):
 
 def integrate_xml_files():
     """Find all XML files and integrate them in date order"""
-    xml_files = glob.glob("*.xml")
+    xml_files = list_xml_files()
     all_items = []
 
     print(f"Found XML files: {xml_files}")
@@ -169,23 +134,11 @@ def integrate_xml_files():
 
     # Remove duplicates from XML items
     print(f"Checking {len(all_items)} XML items for duplicates...")
-    unique_items = ensure_uniqueness(all_items)
+    unique_items = ensure_uniqueness(all_items, log_duplicates=True)
     print(f"Kept {len(unique_items)} unique XML items (removed {len(all_items) - len(unique_items)} duplicates)")
 
     # Sort all items by date
-    def parse_date(item):
-        if 'pubDate' not in item:
-            return datetime.min
-        try:
-            return datetime.strptime(item["pubDate"], "%a, %d %b %Y %H:%M:%S GMT")
-        except:
-            try:
-                # Try alternative date formats
-                return datetime.strptime(item["pubDate"], "%Y-%m-%d %H:%M:%S")
-            except:
-                return datetime.min
-
-    unique_items.sort(key=parse_date, reverse=True)
+    sort_by_pub_date(unique_items)
 
     # Create integrated XML
     create_integrated_xml(unique_items)
@@ -194,36 +147,17 @@ def integrate_xml_files():
 
 def create_integrated_xml(items):
     """Create a single integrated XML file from all items"""
-    # Create root RSS element
-    rss = ET.Element('rss')
-    rss.set('version', '2.0')
-    rss.set('xmlns:media', 'http://search.yahoo.com/mrss/')
-
-    # Create channel
-    channel = ET.SubElement(rss, 'channel')
-
-    # Add channel metadata
-    ET.SubElement(channel, 'title').text = "Integrated News Feed"
-    ET.SubElement(channel, 'link').text = "https://example.com/integrated"
-    ET.SubElement(channel, 'description').text = "Integrated news from multiple XML sources"
-    ET.SubElement(channel, 'language').text = "en-GB"
-    ET.SubElement(channel, 'generator').text = "NFE/5.0"
-    ET.SubElement(channel, 'lastBuildDate').text = datetime.now().strftime("%a, %d %b %Y %H:%M:%S GMT")
-
-    # Add all items
-    for item_data in items:
-        item = ET.SubElement(channel, 'item')
-
-        for field in ['title', 'link', 'guid', 'pubDate', 'description']:
-            if field in item_data and item_data[field]:
-                ET.SubElement(item, field).text = item_data[field]
-
-    # Pretty print and save
-    rough_string = ET.tostring(rss, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
+    channel_fields = [
+        ('title', "Integrated News Feed"),
+        ('link', "https://example.com/integrated"),
+        ('description', "Integrated news from multiple XML sources"),
+        ('language', "en-GB"),
+        ('generator', "NFE/5.0"),
+        ('lastBuildDate', datetime.now().strftime("%a, %d %b %Y %H:%M:%S GMT")),
+    ]
 
-    with open('integrated_news.xml', 'w', encoding='utf-8') as f:
-        f.write(reparsed.toprettyxml(indent="  "))
+    # Stream items straight to disk instead of building a DOM first
+    stream_rss('integrated_news.xml', channel_fields, items)
 
     print(f"Created integrated_news.xml with {len(items)} items")
 
@@ -244,9 +178,13 @@ def main():
     print(f"Added {len(random_events)} random events")
 
     # Save extended news.json
-    with open('news_extended.json', 'w', encoding='utf-8') as f:
-        json.dump(news_data, f, indent=2, ensure_ascii=False)
-    print(f"Saved extended news to news_extended.json with {len(news_data['items'])} total items")
+    with open('news_extended.json', 'wb') as f:
+        f.write(orjson.dumps(news_data, option=orjson.OPT_INDENT_2))
+    extended_count = len(news_data['items'])
+    print(f"Saved extended news to news_extended.json with {extended_count} total items")
+
+    # Release the JSON items before the XML pass so both never coexist
+    del news_data
 
     # Integrate XML files
     print("\nIntegrating XML files...")
@@ -254,7 +192,7 @@ def main():
     print(f"Integrated {len(xml_items)} items from XML files")
 
     print("\nProcessing complete!")
-    print(f"- Extended JSON: news_extended.json ({len(news_data['items'])} items)")
+    print(f"- Extended JSON: news_extended.json ({extended_count} items)")
     print(f"- Integrated XML: integrated_news.xml ({len(xml_items)} items)")
 
 if __name__ == "__main__":
@@ -1,17 +1,50 @@
 #!/usr/bin/env python3
-import requests
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-import json
+import httpx
 import time
 import random
 from datetime import datetime, timedelta
 import urllib.parse
-import glob
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-def fetch_google_news_rss(query, max_retries=3):
-    """Fetch Google News RSS feed for a given query"""
+import orjson
+
+from dedup import ensure_uniqueness
+from http_headers import HEADERS
+from pubdate import sort_by_pub_date
+from rss_xml import ET, ITEM_FIELDS, new_rss_element, write_rss, source_of, list_xml_files
+
+MAX_WORKERS = 6  # Number of simultaneous RSS fetches
+FEED_CACHE_FILE = '.rss_cache.json'  # Per-query ETag / Last-Modified validators
+
+def load_feed_cache():
+    """Load cached HTTP validators for previously fetched queries"""
+    try:
+        with open(FEED_CACHE_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+def save_feed_cache(cache):
+    """Persist HTTP validators so the next run can make conditional requests"""
+    with open(FEED_CACHE_FILE, 'wb') as f:
+        f.write(orjson.dumps(cache, option=orjson.OPT_INDENT_2))
+
+def create_client():
+    """Create a shared HTTP/2 client so all queries multiplex over one connection"""
+    return httpx.Client(
+        http2=True,
+        headers=HEADERS,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=MAX_WORKERS),
+    )
+
+def fetch_google_news_rss(client, query, filename=None, cache=None, max_retries=3):
+    """Fetch Google News RSS feed for a given query.
+
+    When cache holds validators for the query and its XML file exists, a
+    conditional request is made and a 304 returns the file on disk instead.
+    """
     base_url = "https://news.google.com/rss/search"
     params = {
         'q': query,
@@ -22,19 +55,34 @@ def fetch_google_news_rss(query, max_retries=3):
 
     url = f"{base_url}?{urllib.parse.urlencode(params)}"
 
+    headers = {}
+    validators = cache.get(query) if cache is not None else None
+    if validators and filename and os.path.exists(filename):
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+
     for attempt in range(max_retries):
         try:
             print(f"Fetching: {query} (attempt {attempt + 1})")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
+            response = client.get(url, headers=headers)
+
+            if response.status_code == 304:
+                print(f"Not modified: {query} (using cached {filename})")
+                with open(filename, 'rb') as f:
+                    return f.read()
+
             response.raise_for_status()
 
-            # Add small delay to be respectful
-            time.sleep(random.uniform(1, 3))
+            if cache is not None:
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                if etag or last_modified:
+                    cache[query] = {'etag': etag, 'last_modified': last_modified}
 
-            return response.text
+            # Raw bytes let the XML parser honour the declared encoding
+            return response.content
 
         except Exception as e:
             print(f"Error fetching {query} (attempt {attempt + 1}): {e}")
@@ -51,24 +99,13 @@ def parse_rss_content(xml_content):
         items = []
 
         # Find all item elements
-        for item in root.iter('item'):
-            item_data = {}
-
-            # Extract basic fields
-            for field in ['title', 'link', 'guid', 'pubDate', 'description']:
-                element = item.find(field)
-                if element is not None:
-                    item_data[field] = element.text
+        for item in root.iterfind('.//item'):
+            # One findtext per field; empty elements are kept as None
+            item_data = {field: text or None for field in ITEM_FIELDS
+                         if (text := item.findtext(field)) is not None}
 
             # Try to extract source from link
-            if 'link' in item_data:
-                try:
-                    parsed = urllib.parse.urlparse(item_data['link'])
-                    item_data['source'] = f"{parsed.scheme}://{parsed.netloc}"
-                except:
-                    item_data['source'] = "https://news.google.com"
-            else:
-                item_data['source'] = "https://news.google.com"
+            item_data['source'] = source_of(item_data.get('link'))
 
             if item_data:
                 items.append(item_data)
@@ -81,9 +118,7 @@ def parse_rss_content(xml_content):
 def save_as_xml(items, filename, title):
     """Save items as XML file"""
     # Create root RSS element
-    rss = ET.Element('rss')
-    rss.set('version', '2.0')
-    rss.set('xmlns:media', 'http://search.yahoo.com/mrss/')
+    rss = new_rss_element()
 
     # Create channel
     channel = ET.SubElement(rss, 'channel')
@@ -105,54 +140,20 @@ def save_as_xml(items, filename, title):
                 ET.SubElement(item, field).text = item_data[field]
 
     # Pretty print and save
-    rough_string = ET.tostring(rss, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(reparsed.toprettyxml(indent="  "))
+    write_rss(rss, filename)
 
     print(f"Saved {len(items)} items to {filename}")
 
-def ensure_uniqueness(items):
-    """Remove duplicate items based on title, link, or guid"""
-    seen = set()
-    unique_items = []
-
-    for item in items:
-        # Create a unique identifier based on title, link, or guid
-        identifiers = []
-        if 'title' in item and item['title']:
-            identifiers.append(('title', item['title'].strip().lower()))
-        if 'link' in item and item['link']:
-            identifiers.append(('link', item['link'].strip()))
-        if 'guid' in item and item['guid']:
-            identifiers.append(('guid', item['guid'].strip()))
-
-        # Check if any identifier has been seen before
-        is_duplicate = False
-        for id_type, id_value in identifiers:
-            if id_value in seen:
-                is_duplicate = True
-                break
-
-        if not is_duplicate:
-            # Add all identifiers to seen set
-            for id_type, id_value in identifiers:
-                seen.add(id_value)
-            unique_items.append(item)
-
-    return unique_items
-
 def load_existing_xml_files():
     """Load all existing XML files"""
-    xml_files = glob.glob("*.xml")
+    xml_files = list_xml_files()
     all_items = []
 
     print(f"Loading existing XML files: {xml_files}")
 
     for xml_file in xml_files:
         try:
-            with open(xml_file, 'r', encoding='utf-8') as f:
+            with open(xml_file, 'rb') as f:
                 content = f.read()
                 items = parse_rss_content(content)
                 all_items.extend(items)
@@ -186,12 +187,19 @@ def main():
 
     print("Starting disaster news collection...")
 
-    # Fetch news for each disaster type
-    for query, filename in disaster_queries:
+    # Fetch all disaster types concurrently over one shared HTTP/2 client
+    print(f"Fetching {len(disaster_queries)} feeds (Workers: {MAX_WORKERS})...")
+    feed_cache = load_feed_cache()
+    with create_client() as client, ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        fetched = list(executor.map(
+            lambda qf: fetch_google_news_rss(client, qf[0], qf[1], feed_cache),
+            disaster_queries
+        ))
+    save_feed_cache(feed_cache)
+
+    for (query, filename), xml_content in zip(disaster_queries, fetched):
         print(f"\nProcessing: {query}")
 
-        # Fetch RSS content
-        xml_content = fetch_google_news_rss(query)
         if xml_content:
             # Parse and save as XML
             items = parse_rss_content(xml_content)
@@ -214,18 +222,7 @@ def main():
     print(f"Kept {len(unique_items)} unique items (removed {len(all_items) - len(unique_items)} duplicates)")
 
     # Sort by date
-    def parse_date(item):
-        if 'pubDate' not in item:
-            return datetime.min
-        try:
-            return datetime.strptime(item["pubDate"], "%a, %d %b %Y %H:%M:%S GMT")
-        except:
-            try:
-                return datetime.strptime(item["pubDate"], "%Y-%m-%d %H:%M:%S")
-            except:
-                return datetime.min
-
-    unique_items.sort(key=parse_date, reverse=True)
+    sort_by_pub_date(unique_items)
 
     # Create unified JSON structure
     unified_data = {
@@ -241,8 +238,8 @@ def main():
     }
 
     # Save unified JSON
-    with open('unified_disaster_news.json', 'w', encoding='utf-8') as f:
-        json.dump(unified_data, f, indent=2, ensure_ascii=False)
+    with open('unified_disaster_news.json', 'wb') as f:
+        f.write(orjson.dumps(unified_data, option=orjson.OPT_INDENT_2))
 
     print(f"Created unified_disaster_news.json with {len(unique_items)} unique items")
 
@@ -1,48 +1,28 @@
 #!/usr/bin/env python3
-import requests
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
-import json
-import time
-import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-import urllib.parse
-import glob
 import os
 
-def fetch_google_news_rss(query, max_retries=3):
-    """Fetch Google News RSS feed for a given query"""
-    base_url = "https://news.google.com/rss/search"
-    params = {
-        'q': query,
-        'hl': 'en-GB',
-        'gl': 'GB',
-        'ceid': 'GB:en'
-    }
+import orjson
 
-    url = f"{base_url}?{urllib.parse.urlencode(params)}"
+from dedup import ensure_uniqueness
+from rss_xml import ET, ITEM_FIELDS, stream_rss, source_of, list_xml_files
+from google_news import fetch_all, unique_queries
+from pubdate import sort_by_pub_date
 
-    for attempt in range(max_retries):
-        try:
-            print(f"Fetching: {query} (attempt {attempt + 1})")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+RAW_ITEMS_FILE = 'raw_items.jsonl'
 
-            # Add small delay to be respectful
-            time.sleep(random.uniform(0.5, 2))
+def extract_item(item):
+    """Build an item dict from an <item> element"""
+    # One findtext per field; empty elements are kept as None
+    item_data = {field: text or None for field in ITEM_FIELDS
+                 if (text := item.findtext(field)) is not None}
 
-            return response.text
+    # Try to extract source from link
+    item_data['source'] = source_of(item_data.get('link'))
 
-        except Exception as e:
-            print(f"Error fetching {query} (attempt {attempt + 1}): {e}")
-            if attempt < max_retries - 1:
-                time.sleep(random.uniform(1, 3))
-            else:
-                print(f"Failed to fetch after {max_retries} attempts")
-                return None
+    return item_data
 
 def parse_rss_content(xml_content):
     """Parse RSS XML content and extract items"""
@@ -52,24 +32,7 @@ def parse_rss_content(xml_content):
 
         # Find all item elements
         for item in root.iter('item'):
-            item_data = {}
-
-            # Extract basic fields
-            for field in ['title', 'link', 'guid', 'pubDate', 'description']:
-                element = item.find(field)
-                if element is not None:
-                    item_data[field] = element.text
-
-            # Try to extract source from link
-            if 'link' in item_data:
-                try:
-                    parsed = urllib.parse.urlparse(item_data['link'])
-                    item_data['source'] = f"{parsed.scheme}://{parsed.netloc}"
-                except:
-                    item_data['source'] = "https://news.google.com"
-            else:
-                item_data['source'] = "https://news.google.com"
-
+            item_data = extract_item(item)
             if item_data:
                 items.append(item_data)
 
@@ -79,92 +42,84 @@ def parse_rss_content(xml_content):
         return []
 
 def save_as_xml(items, filename, title):
-    """Save items as XML file"""
-    # Create root RSS element
-    rss = ET.Element('rss')
-    rss.set('version', '2.0')
-    rss.set('xmlns:media', 'http://search.yahoo.com/mrss/')
-
-    # Create channel
-    channel = ET.SubElement(rss, 'channel')
-
-    # Add channel metadata
-    ET.SubElement(channel, 'title').text = title
-    ET.SubElement(channel, 'link').text = "https://news.google.com"
-    ET.SubElement(channel, 'description').text = f"Google News feed for {title}"
-    ET.SubElement(channel, 'language').text = "en-GB"
-    ET.SubElement(channel, 'generator').text = "NFE/5.0"
-    ET.SubElement(channel, 'lastBuildDate').text = datetime.now().strftime("%a, %d %b %Y %H:%M:%S GMT")
-
-    # Add all items
-    for item_data in items:
-        item = ET.SubElement(channel, 'item')
-
-        for field in ['title', 'link', 'guid', 'pubDate', 'description']:
-            if field in item_data and item_data[field]:
-                ET.SubElement(item, field).text = item_data[field]
-
-    # Pretty print and save
-    rough_string = ET.tostring(rss, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(reparsed.toprettyxml(indent="  "))
+    """Save items as XML file, streamed element by element"""
+    channel_fields = (
+        ('title', title),
+        ('link', "https://news.google.com"),
+        ('description', f"Google News feed for {title}"),
+        ('language', "en-GB"),
+        ('generator', "NFE/5.0"),
+        ('lastBuildDate', datetime.now().strftime("%a, %d %b %Y %H:%M:%S GMT")),
+    )
+    stream_rss(filename, channel_fields, items)
 
     print(f"Saved {len(items)} items to {filename}")
 
-def ensure_uniqueness(items):
-    """Remove duplicate items based on title, link, or guid"""
-    seen = set()
-    unique_items = []
-
-    for item in items:
-        # Create a unique identifier based on title, link, or guid
-        identifiers = []
-        if 'title' in item and item['title']:
-            identifiers.append(('title', item['title'].strip().lower()))
-        if 'link' in item and item['link']:
-            identifiers.append(('link', item['link'].strip()))
-        if 'guid' in item and item['guid']:
-            identifiers.append(('guid', item['guid'].strip()))
-
-        # Check if any identifier has been seen before
-        is_duplicate = False
-        for id_type, id_value in identifiers:
-            if id_value in seen:
-                is_duplicate = True
-                break
-
-        if not is_duplicate:
-            # Add all identifiers to seen set
-            for id_type, id_value in identifiers:
-                seen.add(id_value)
-            unique_items.append(item)
-
-    return unique_items
-
-def load_existing_xml_files():
-    """Load all existing XML files"""
-    xml_files = glob.glob("*.xml")
+def parse_xml_file(xml_file):
+    """Stream one RSS file into item dicts; returns (items, error message or None)"""
+    items = []
+    try:
+        # Only one <item> subtree is held at a time
+        elem = None
+        for _, elem in ET.iterparse(xml_file, events=("end",)):
+            if elem.tag == 'item':
+                items.append(extract_item(elem))
+                elem.clear()
+        if elem is not None:
+            elem.clear()  # last "end" element is the root
+    except Exception as e:
+        return [], str(e)
+    return items, None
+
+def load_existing_xml_files(skip=()):
+    """Load all existing XML files, parsing them in parallel processes.
+
+    Files named in skip (already held in memory) are not parsed again.
+    """
+    xml_files = [name for name in list_xml_files() if name not in skip]
     all_items = []
 
     print(f"Loading existing XML files: {len(xml_files)} files found")
-
-    for xml_file in xml_files:
-        try:
-            with open(xml_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                items = parse_rss_content(content)
-                all_items.extend(items)
-                if items:
-                    print(f"Loaded {len(items)} items from {xml_file}")
-        except Exception as e:
-            print(f"Error loading {xml_file}: {e}")
+    if not xml_files:
+        return all_items
+
+    with ProcessPoolExecutor() as pool:
+        results = pool.map(parse_xml_file, xml_files, chunksize=4)
+        for xml_file, (items, error) in zip(xml_files, results):
+            if error:
+                print(f"Error loading {xml_file}: {error}")
+                continue
+            all_items.extend(items)
+            if items:
+                print(f"Loaded {len(items)} items from {xml_file}")
 
     return all_items
 
+def load_raw_items(filename=RAW_ITEMS_FILE):
+    """Load items previously appended to the raw JSONL store"""
+    items = []
+    try:
+        with open(filename, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    items.append(orjson.loads(line))
+    except FileNotFoundError:
+        pass
+    print(f"Loaded {len(items)} items from {filename}")
+    return items
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch massive disaster news and create unified JSON")
+    parser.add_argument('--no-xml', action='store_true',
+                        help="don't write per-query XML files or merge existing *.xml feeds; "
+                             f"items only go to {RAW_ITEMS_FILE} and the unified JSON")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"start from the items already in {RAW_ITEMS_FILE} instead of truncating it")
+    return parser.parse_args()
+
 def main():
     """Main function to fetch massive disaster news and create unified JSON"""
+    args = parse_args()
 
     # Comprehensive disaster queries to reach 10k+ items
     disaster_queries = [
@@ -271,59 +226,60 @@ def main():
         ("catastrophe 2025", "catastrophe_2025.xml"),
         ("calamity 2025", "calamity_2025.xml")
     ]
+    disaster_queries = unique_queries(disaster_queries)
 
     print(f"Starting massive disaster news collection with {len(disaster_queries)} queries...")
     print("Target: 10,000+ items")
 
     total_items_fetched = 0
 
-    # Fetch news for each disaster type
-    for i, (query, filename) in enumerate(disaster_queries, 1):
-        print(f"\n[{i}/{len(disaster_queries)}] Processing: {query}")
+    # Parsed items are kept in memory (and appended to the raw JSONL store)
+    # rather than re-read from the XML files written for them below
+    all_items = load_raw_items() if args.resume else []
+    written_xml = set()
 
-        # Fetch RSS content
-        xml_content = fetch_google_news_rss(query)
-        if xml_content:
-            # Parse and save as XML
-            items = parse_rss_content(xml_content)
-            if items:
-                save_as_xml(items, filename, f"Disaster News: {query.replace(' 2025 2026', '').replace(' 2025', '').title()}")
-                total_items_fetched += len(items)
-                print(f"Total items fetched so far: {total_items_fetched}")
+    # Fetch all disaster types concurrently, then process in query order
+    fetched = fetch_all([query for query, _ in disaster_queries])
+
+    with open(RAW_ITEMS_FILE, 'ab' if args.resume else 'wb') as raw_file:
+        for i, ((query, filename), xml_content) in enumerate(zip(disaster_queries, fetched), 1):
+            print(f"\n[{i}/{len(disaster_queries)}] Processing: {query}")
+
+            if xml_content:
+                items = parse_rss_content(xml_content)
+                if items:
+                    all_items.extend(items)
+                    raw_file.write(b''.join(orjson.dumps(item) + b'\n' for item in items))
+                    if not args.no_xml:
+                        # create_balanced_dataset.py and create_final_unified.py read these
+                        save_as_xml(items, filename, f"Disaster News: {query.replace(' 2025 2026', '').replace(' 2025', '').title()}")
+                        written_xml.add(filename)
+                    total_items_fetched += len(items)
+                    print(f"Total items fetched so far: {total_items_fetched}")
+                else:
+                    print(f"No items found for {query}")
             else:
-                print(f"No items found for {query}")
-        else:
-            print(f"Failed to fetch content for {query}")
+                print(f"Failed to fetch content for {query}")
 
-        # Progress update
-        if i % 10 == 0:
-            print(f"\n*** PROGRESS UPDATE: Completed {i}/{len(disaster_queries)} queries ***")
-            print(f"*** Total items fetched: {total_items_fetched} ***\n")
+            # Progress update
+            if i % 10 == 0:
+                print(f"\n*** PROGRESS UPDATE: Completed {i}/{len(disaster_queries)} queries ***")
+                print(f"*** Total items fetched: {total_items_fetched} ***\n")
 
-    # Load all XML files and create unified JSON
     print("\n" + "="*60)
-    print("Creating unified JSON from all XML files...")
+    print("Creating unified JSON from collected items...")
 
-    all_items = load_existing_xml_files()
+    # Merge the other feeds in the directory (earlier runs, other fetchers)
+    if not args.no_xml:
+        all_items.extend(load_existing_xml_files(skip=written_xml))
 
     # Remove duplicates
     print(f"Removing duplicates from {len(all_items)} total items...")
     unique_items = ensure_uniqueness(all_items)
     print(f"Kept {len(unique_items)} unique items (removed {len(all_items) - len(unique_items)} duplicates)")
 
-    # Sort by date
-    def parse_date(item):
-        if 'pubDate' not in item:
-            return datetime.min
-        try:
-            return datetime.strptime(item["pubDate"], "%a, %d %b %Y %H:%M:%S GMT")
-        except:
-            try:
-                return datetime.strptime(item["pubDate"], "%Y-%m-%d %H:%M:%S")
-            except:
-                return datetime.min
-
-    unique_items.sort(key=parse_date, reverse=True)
+    # Sort by date (each pubDate parsed once)
+    sort_by_pub_date(unique_items)
 
     # Create unified JSON structure
     unified_data = {
@@ -339,8 +295,8 @@ def main():
     }
 
     # Save unified JSON
-    with open('massive_unified_disaster_news.json', 'w', encoding='utf-8') as f:
-        json.dump(unified_data, f, indent=2, ensure_ascii=False)
+    with open('massive_unified_disaster_news.json', 'wb') as f:
+        f.write(orjson.dumps(unified_data, option=orjson.OPT_INDENT_2))
 
     print(f"Created massive_unified_disaster_news.json with {len(unique_items)} unique items")
 
@@ -349,7 +305,7 @@ def main():
     print("FINAL SUMMARY:")
     print(f"- Processed {len(disaster_queries)} different disaster queries")
     print(f"- Total raw items fetched: {total_items_fetched}")
-    print(f"- Total items loaded from all XML files: {len(all_items)}")
+    print(f"- Total items collected: {len(all_items)}")
     print(f"- Unique items after deduplication: {len(unique_items)}")
     print(f"- Duplicates removed: {len(all_items) - len(unique_items)}")
     print(f"- Final JSON file: massive_unified_disaster_news.json")
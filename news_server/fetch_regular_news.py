@@ -1,46 +1,15 @@
 #!/usr/bin/env python3
-import requests
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import json
-import time
-import random
 from datetime import datetime, timedelta
-import urllib.parse
 import glob
 import os
+import random
+import time
 
-def fetch_google_news_rss(query, max_retries=3):
-    """Fetch Google News RSS feed for a given query"""
-    base_url = "https://news.google.com/rss/search"
-    params = {
-        'q': query,
-        'hl': 'en-GB',
-        'gl': 'GB',
-        'ceid': 'GB:en'
-    }
-
-    url = f"{base_url}?{urllib.parse.urlencode(params)}"
-
-    for attempt in range(max_retries):
-        try:
-            print(f"Fetching: {query} (attempt {attempt + 1})")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-
-            time.sleep(random.uniform(0.3, 1.5))
-            return response.text
-
-        except Exception as e:
-            print(f"Error fetching {query} (attempt {attempt + 1}): {e}")
-            if attempt < max_retries - 1:
-                time.sleep(random.uniform(1, 3))
-            else:
-                print(f"Failed to fetch after {max_retries} attempts")
-                return None
+from google_news import MAX_CONCURRENCY, fetch_all, unique_queries
+from rss_xml import ET, ITEM_FIELDS, stream_rss, source_of
+
+TARGET_ITEMS = 6000  # Stop fetching once this many items have been saved
 
 def parse_rss_content(xml_content):
     """Parse RSS XML content and extract items"""
@@ -49,21 +18,11 @@ def parse_rss_content(xml_content):
         items = []
 
         for item in root.iter('item'):
-            item_data = {}
-
-            for field in ['title', 'link', 'guid', 'pubDate', 'description']:
-                element = item.find(field)
-                if element is not None:
-                    item_data[field] = element.text
-
-            if 'link' in item_data:
-                try:
-                    parsed = urllib.parse.urlparse(item_data['link'])
-                    item_data['source'] = f"{parsed.scheme}://{parsed.netloc}"
-                except:
-                    item_data['source'] = "https://news.google.com"
-            else:
-                item_data['source'] = "https://news.google.com"
+            # One findtext per field; empty elements are kept as None
+            item_data = {field: text or None for field in ITEM_FIELDS
+                         if (text := item.findtext(field)) is not None}
+
+            item_data['source'] = source_of(item_data.get('link'))
 
             if item_data:
                 items.append(item_data)
@@ -74,31 +33,16 @@ def parse_rss_content(xml_content):
         return []
 
 def save_as_xml(items, filename, title):
-    """Save items as XML file"""
-    rss = ET.Element('rss')
-    rss.set('version', '2.0')
-    rss.set('xmlns:media', 'http://search.yahoo.com/mrss/')
-
-    channel = ET.SubElement(rss, 'channel')
-
-    ET.SubElement(channel, 'title').text = title
-    ET.SubElement(channel, 'link').text = "https://news.google.com"
-    ET.SubElement(channel, 'description').text = f"Google News feed for {title}"
-    ET.SubElement(channel, 'language').text = "en-GB"
-    ET.SubElement(channel, 'generator').text = "NFE/5.0"
-    ET.SubElement(channel, 'lastBuildDate').text = datetime.now().strftime("%a, %d %b %Y %H:%M:%S GMT")
-
-    for item_data in items:
-        item = ET.SubElement(channel, 'item')
-        for field in ['title', 'link', 'guid', 'pubDate', 'description']:
-            if field in item_data and item_data[field]:
-                ET.SubElement(item, field).text = item_data[field]
-
-    rough_string = ET.tostring(rss, 'utf-8')
-    reparsed = minidom.parseString(rough_string)
-
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(reparsed.toprettyxml(indent="  "))
+    """Save items as XML file, streamed element by element"""
+    channel_fields = (
+        ('title', title),
+        ('link', "https://news.google.com"),
+        ('description', f"Google News feed for {title}"),
+        ('language', "en-GB"),
+        ('generator', "NFE/5.0"),
+        ('lastBuildDate', datetime.now().strftime("%a, %d %b %Y %H:%M:%S GMT")),
+    )
+    stream_rss(filename, channel_fields, items)
 
     print(f"Saved {len(items)} items to {filename}")
 
@@ -213,32 +157,44 @@ def main():
         ("entertainment news 2025", "entertainment_news_2025.xml"),
         ("sports headlines 2025", "sports_headlines_2025.xml"),
     ]
+    regular_news_queries = unique_queries(regular_news_queries)
 
     print(f"Starting regular news collection with {len(regular_news_queries)} queries...")
     print("Target: 6,000+ regular news items")
 
     total_items_fetched = 0
 
-    for i, (query, filename) in enumerate(regular_news_queries, 1):
-        print(f"\n[{i}/{len(regular_news_queries)}] Processing: {query}")
-
-        xml_content = fetch_google_news_rss(query)
-        if xml_content:
-            items = parse_rss_content(xml_content)
-            if items:
-                save_as_xml(items, filename, f"Regular News: {query.replace(' 2025 2026', '').replace(' 2025', '').title()}")
-                total_items_fetched += len(items)
-                print(f"Total regular news items fetched so far: {total_items_fetched}")
+    # Fetch one semaphore-sized batch at a time so no requests are sent once
+    # the target is reached; each batch is processed in query order
+    for start in range(0, len(regular_news_queries), MAX_CONCURRENCY):
+        if start:
+            time.sleep(random.uniform(0.3, 1.5))  # Be polite between batches
+
+        batch = regular_news_queries[start:start + MAX_CONCURRENCY]
+        fetched = fetch_all([query for query, _ in batch])
+
+        for i, ((query, filename), xml_content) in enumerate(zip(batch, fetched), start + 1):
+            print(f"\n[{i}/{len(regular_news_queries)}] Processing: {query}")
+
+            if xml_content:
+                items = parse_rss_content(xml_content)
+                if items:
+                    save_as_xml(items, filename, f"Regular News: {query.replace(' 2025 2026', '').replace(' 2025', '').title()}")
+                    total_items_fetched += len(items)
+                    print(f"Total regular news items fetched so far: {total_items_fetched}")
+                else:
+                    print(f"No items found for {query}")
             else:
-                print(f"No items found for {query}")
-        else:
-            print(f"Failed to fetch content for {query}")
+                print(f"Failed to fetch content for {query}")
+
+            if i % 10 == 0:
+                print(f"\n*** PROGRESS UPDATE: Completed {i}/{len(regular_news_queries)} queries ***")
+                print(f"*** Total regular news items fetched: {total_items_fetched} ***\n")
 
-        if i % 10 == 0:
-            print(f"\n*** PROGRESS UPDATE: Completed {i}/{len(regular_news_queries)} queries ***")
-            print(f"*** Total regular news items fetched: {total_items_fetched} ***\n")
+            if total_items_fetched >= TARGET_ITEMS:
+                break
 
-        if total_items_fetched >= 6000:
+        if total_items_fetched >= TARGET_ITEMS:
             print(f"\n🎉 Target reached! {total_items_fetched} items fetched")
             break
 
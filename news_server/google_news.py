@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Concurrent Google News RSS fetching shared by the bulk fetch scripts.
+"""
+
+import asyncio
+import random
+import urllib.parse
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+from http_headers import HEADERS
+
+BASE_URL = "https://news.google.com/rss/search"
+MAX_CONCURRENCY = 16  # Simultaneous in-flight queries
+MAX_BACKOFF = 16  # Cap (seconds) for exponential backoff and Retry-After waits
+THROTTLE_LIMIT = 3  # Consecutive 429s before every fetch pauses
+THROTTLE_PAUSE = 30  # Seconds to pause all fetches once throttled
+RETRY_STATUSES = (429, 503)
+
+
+def unique_queries(queries):
+    """Drop (query, filename) pairs whose filename or normalised query was already listed"""
+    seen_queries = set()
+    seen_filenames = set()
+    pruned = []
+    for query, filename in queries:
+        key = ' '.join(query.lower().split())
+        if key in seen_queries or filename in seen_filenames:
+            print(f"Skipping duplicate query: {query} ({filename})")
+            continue
+        seen_queries.add(key)
+        seen_filenames.add(filename)
+        pruned.append((query, filename))
+    return pruned
+
+
+def build_url(query):
+    """Google News RSS search URL for a query"""
+    params = {
+        'q': query,
+        'hl': 'en-GB',
+        'gl': 'GB',
+        'ceid': 'GB:en'
+    }
+    return f"{BASE_URL}?{urllib.parse.urlencode(params)}"
+
+
+def retry_after_seconds(value, default):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if value:
+        try:
+            return min(max(float(value), 0.0), MAX_BACKOFF)
+        except ValueError:
+            try:
+                delta = parsedate_to_datetime(value) - datetime.now(timezone.utc)
+                return min(max(delta.total_seconds(), 0.0), MAX_BACKOFF)
+            except (TypeError, ValueError):
+                pass
+    return min(default, MAX_BACKOFF)
+
+
+class Throttle:
+    """Pauses every fetch for THROTTLE_PAUSE seconds after THROTTLE_LIMIT consecutive 429s"""
+
+    def __init__(self):
+        self.open = asyncio.Event()
+        self.open.set()
+        self.consecutive = 0
+
+    async def wait(self):
+        await self.open.wait()
+
+    def record(self, throttled):
+        if not throttled:
+            self.consecutive = 0
+            return
+        self.consecutive += 1
+        if self.consecutive >= THROTTLE_LIMIT and self.open.is_set():
+            print(f"Rate limited {self.consecutive} times in a row, pausing all fetches for {THROTTLE_PAUSE}s")
+            self.open.clear()
+            asyncio.get_running_loop().call_later(THROTTLE_PAUSE, self._reopen)
+
+    def _reopen(self):
+        self.consecutive = 0
+        self.open.set()
+
+
+async def fetch_google_news_rss(session, sem, query, throttle, max_retries=3):
+    """Fetch Google News RSS feed for a given query, returning raw XML bytes"""
+    url = build_url(query)
+
+    async with sem:
+        for attempt in range(max_retries):
+            await throttle.wait()
+            try:
+                print(f"Fetching: {query} (attempt {attempt + 1})")
+                async with session.get(url) as response:
+                    if response.status in RETRY_STATUSES:
+                        throttle.record(response.status == 429)
+                        # Honour the server's Retry-After instead of guessing
+                        delay = retry_after_seconds(response.headers.get('Retry-After'), 2 ** attempt)
+                        print(f"Throttled fetching {query} (HTTP {response.status}, attempt {attempt + 1})")
+                    else:
+                        response.raise_for_status()
+                        content = await response.read()
+                        throttle.record(False)
+                        return content
+
+            except Exception as e:
+                print(f"Error fetching {query} (attempt {attempt + 1}): {e}")
+                # Exponential backoff with jitter for network/HTTP errors
+                delay = min(2 ** attempt, MAX_BACKOFF) * (0.5 + random.random())
+
+            if attempt < max_retries - 1:
+                await asyncio.sleep(delay + random.random())
+            else:
+                print(f"Failed to fetch after {max_retries} attempts")
+                return None
+
+
+async def _fetch_all(queries):
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    throttle = Throttle()
+    connector = aiohttp.TCPConnector(limit=32, limit_per_host=MAX_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS, timeout=timeout) as session:
+        return await asyncio.gather(*(fetch_google_news_rss(session, sem, query, throttle) for query in queries))
+
+
+def fetch_all(queries):
+    """Fetch every query concurrently; results are in query order (None on failure)"""
+    return asyncio.run(_fetch_all(queries))
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""
+HTTP request headers shared by the Google News fetch scripts.
+Kept free of HTTP client imports so httpx and aiohttp scripts can both use it.
+"""
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
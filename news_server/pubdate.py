@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+pubDate parsing and sorting helpers shared by the news scripts.
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from operator import itemgetter
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+
+def fast_rfc822(value):
+    """Parse 'Mon, 05 Jan 2026 10:00:00 GMT' directly; None for any other shape."""
+    parts = value.split()
+    if len(parts) != 6 or parts[5] != 'GMT':
+        return None
+    try:
+        hh, mm, ss = parts[4].split(':')
+        return datetime(int(parts[3]), _MONTHS[parts[2]], int(parts[1]), int(hh), int(mm), int(ss))
+    except (KeyError, ValueError):
+        return None
+
+
+def parse_pub_date(value):
+    """Parse an RSS pubDate into a naive UTC datetime (datetime.min if unparseable)."""
+    if not value:
+        return datetime.min
+    parsed = fast_rfc822(value)
+    if parsed is not None:
+        return parsed
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            # Try alternative date formats
+            return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            return datetime.min
+
+    # "GMT" dates come back timezone-aware; keep keys comparable with datetime.min
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def sort_by_pub_date(items):
+    """Sort items newest first in place, parsing each pubDate exactly once."""
+    keyed = [(parse_pub_date(item.get('pubDate')), item) for item in items]
+    keyed.sort(key=itemgetter(0), reverse=True)
+    items[:] = [item for _, item in keyed]
+    return items
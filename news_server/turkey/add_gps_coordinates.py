@@ -5,6 +5,8 @@ Uses LLM to extract precise geographical locations from news titles and descript
 """
 
 import json
+import os
+import shutil
 import re
 import time
 import random
@@ -275,8 +277,11 @@ def main():
 
     # Also update the original file
     try:
-        with open(input_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Byte copy of the output just written (no second encode) to a temp file,
+        # then rename over the original so an interrupted run never truncates it
+        tmp_file = f"{input_file}.tmp"
+        shutil.copyfile(output_file, tmp_file)
+        os.replace(tmp_file, input_file)
         print(f"✓ Updated original {input_file} with GPS coordinates")
     except Exception as e:
         print(f"⚠ Warning: Could not update original file: {e}")
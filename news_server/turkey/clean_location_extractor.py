@@ -29,6 +29,9 @@ except ImportError as e:
 # Default Turkey coordinates (center of country)
 TURKEY_DEFAULT_COORDS = {"lat": 39.0, "lng": 35.0}
 
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+GEOCODE_HEADERS = {"User-Agent": "ichack-disaster-app"}
+
 # Regex pattern for known Turkish locations
 TURKISH_LOCATION_PATTERN = re.compile(
     r'\b(Istanbul|Ankara|Izmir|Bursa|Antalya|Adana|Konya|Gaziantep|Mersin|Kayseri|'
@@ -45,17 +48,14 @@ TURKISH_LOCATION_PATTERN = re.compile(
 def geocode(location_name: str, country_hint: str = "Turkey") -> dict:
     """Convert location name to GPS coordinates using OpenStreetMap Nominatim.
     Falls back to Turkey default coordinates if location not found."""
-    url = "https://nominatim.openstreetmap.org/search"
     location_name = location_name.split(',')[0]
     params = {
         "q": f"{location_name}, {country_hint}",
         "format": "json",
         "limit": 1
     }
-    headers = {"User-Agent": "ichack-disaster-app"}
-
     try:
-        response = requests.get(url, params=params, headers=headers, timeout=5)
+        response = requests.get(NOMINATIM_URL, params=params, headers=GEOCODE_HEADERS, timeout=5)
         data = response.json()
         if data:
             return {"lat": float(data[0]["lat"]), "lng": float(data[0]["lon"])}
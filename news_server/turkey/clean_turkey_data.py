@@ -3,26 +3,27 @@
 Cleans turkey.json data by removing or fixing location entries with ## tokens.
 """
 
-import json
+import os
 import re
+import shutil
+
+import orjson
+
+# Set CLEAN_VERBOSE=1 to log every fixed/removed location
+VERBOSE = os.environ.get('CLEAN_VERBOSE') == '1'
+MAX_EXAMPLES = 10
 
 def clean_location_name(name):
     """Remove ## tokens and clean up location names."""
     if not name or '##' not in name:
         return name
 
-    # Split by comma and filter out parts with ##
-    parts = name.split(',')
-    clean_parts = []
-
-    for part in parts:
-        part = part.strip()
-        # Skip if contains ##
-        if '##' in part:
-            continue
-        # Keep valid location names
-        if len(part) >= 2 and not part.startswith(('#', '@', '.', ',')):
-            clean_parts.append(part)
+    # Split by comma and keep valid location names: no ##, at least two
+    # characters, and not starting with a stray token character
+    clean_parts = [
+        part for part in (p.strip() for p in name.split(','))
+        if len(part) >= 2 and part[0] not in '#@.,' and '##' not in part
+    ]
 
     # Return cleaned name or None if nothing valid remains
     if clean_parts:
@@ -33,12 +34,13 @@ def clean_turkey_data():
     """Clean the turkey.json file."""
     print("Loading turkey.json...")
 
-    with open('turkey.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open('turkey.json', 'rb') as f:
+        data = orjson.loads(f.read())
 
     items_with_bad_locations = 0
     items_fixed = 0
     items_removed_location = 0
+    examples = []
 
     for item in data.get('items', []):
         if 'location' in item and 'name' in item['location']:
@@ -55,33 +57,55 @@ def clean_turkey_data():
                     # Update with cleaned name
                     item['location']['name'] = cleaned_name
                     items_fixed += 1
-                    print(f"Fixed: '{original_name}' -> '{cleaned_name}'")
+                    if VERBOSE:
+                        print(f"Fixed: '{original_name}' -> '{cleaned_name}'")
+                    elif len(examples) < MAX_EXAMPLES:
+                        examples.append(f"Fixed: '{original_name}' -> '{cleaned_name}'")
                 else:
                     # Remove location entirely if no valid name remains
                     del item['location']
                     items_removed_location += 1
-                    print(f"Removed location: '{original_name}'")
+                    if VERBOSE:
+                        print(f"Removed location: '{original_name}'")
+                    elif len(examples) < MAX_EXAMPLES:
+                        examples.append(f"Removed location: '{original_name}'")
+
+    if examples:
+        print("\n".join(examples))
+        if items_with_bad_locations > len(examples):
+            print(f"... {items_with_bad_locations - len(examples)} more (set CLEAN_VERBOSE=1 to list all)")
+
+    # Nothing to fix: leave turkey.json untouched and skip the rewrite
+    if items_with_bad_locations == 0:
+        print("\n✅ No ## tokens found; turkey.json is already clean")
+        return
 
     # Save cleaned data
     print("\nSaving cleaned data...")
-    with open('turkey_cleaned.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open('turkey_cleaned.json', 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
     print(f"\n✅ Cleaning complete!")
     print(f"   - Items with ## tokens: {items_with_bad_locations}")
     print(f"   - Items fixed: {items_fixed}")
     print(f"   - Locations removed: {items_removed_location}")
-    print(f"   - Saved to: turkey_cleaned.json")
-
-    # Also save backup of original
-    import shutil
-    shutil.copy('turkey.json', 'turkey_backup_before_cleaning.json')
-    print(f"   - Original backed up to: turkey_backup_before_cleaning.json")
 
-    # Auto-replace if we found and fixed issues
-    if items_with_bad_locations > 0:
-        shutil.copy('turkey_cleaned.json', 'turkey.json')
-        print("\n✅ turkey.json has been replaced with cleaned version")
+    # Keep the original as a backup (a hard link where supported, so nothing is
+    # copied), then swap a copy of the cleaned file in with a single rename;
+    # turkey.json exists at every point, even if the process dies part way,
+    # and turkey_cleaned.json stays behind as the cleaning output
+    backup_file = 'turkey_backup_before_cleaning.json'
+    try:
+        if os.path.lexists(backup_file):
+            os.remove(backup_file)
+        os.link('turkey.json', backup_file)
+    except OSError:
+        shutil.copy2('turkey.json', backup_file)
+    print(f"   - Original backed up to: {backup_file}")
+    tmp_file = 'turkey.json.tmp'
+    shutil.copyfile('turkey_cleaned.json', tmp_file)
+    os.replace(tmp_file, 'turkey.json')
+    print("\n✅ turkey.json has been replaced with cleaned version")
 
 if __name__ == "__main__":
     clean_turkey_data()
\ No newline at end of file
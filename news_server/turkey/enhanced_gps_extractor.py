@@ -8,6 +8,8 @@ Enhanced GPS coordinate extractor for Turkey earthquake news using HuggingFace T
 """
 
 import json
+import os
+import shutil
 import re
 import time
 import random
@@ -468,8 +470,11 @@ def main():
 
     # Update original file
     try:
-        with open(input_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Byte copy of the output just written (no second encode) to a temp file,
+        # then rename over the original so an interrupted run never truncates it
+        tmp_file = f"{input_file}.tmp"
+        shutil.copyfile(output_file, tmp_file)
+        os.replace(tmp_file, input_file)
         print(f"✓ Updated original {input_file}")
     except Exception as e:
         print(f"⚠ Warning: Could not update original file: {e}")
@@ -21,6 +21,8 @@ warnings.filterwarnings("ignore")
 # --- PERFORMANCE CONFIG ---
 MAX_WORKERS = 10  # Number of simultaneous web requests
 TURKEY_DEFAULT_COORDS = {"lat": 39.0, "lng": 35.0}
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+GEOCODE_HEADERS = {"User-Agent": "FastGeo"}
 
 class FastNERExtractor:
     def __init__(self):
@@ -78,9 +80,7 @@ class FastNERExtractor:
 def geocode_fast(name):
     """Parallel-friendly geocoder"""
     try:
-        url = "https://nominatim.openstreetmap.org/search"
-        headers = {"User-Agent": "FastGeo"}
-        r = requests.get(url, params={"q": f"{name}, Turkey", "format": "json", "limit": 1}, headers=headers, timeout=2)
+        r = requests.get(NOMINATIM_URL, params={"q": f"{name}, Turkey", "format": "json", "limit": 1}, headers=GEOCODE_HEADERS, timeout=2)
         data = r.json()
         if data: return {"lat": float(data[0]["lat"]), "lng": float(data[0]["lon"])}
     except: pass
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 import json
@@ -10,7 +12,24 @@ import urllib.parse
 import glob
 import os
 
-def fetch_google_news_rss(query, max_retries=3):
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate'
+}
+
+def create_session():
+    """Shared session so every query reuses the pooled news.google.com connection"""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+SESSION = create_session()
+
+def fetch_google_news_rss(query):
     """Fetch Google News RSS feed for a given query"""
     base_url = "https://news.google.com/rss/search"
     params = {
@@ -22,27 +41,20 @@ def fetch_google_news_rss(query, max_retries=3):
 
     url = f"{base_url}?{urllib.parse.urlencode(params)}"
 
-    for attempt in range(max_retries):
-        try:
-            print(f"Fetching: {query} (attempt {attempt + 1})")
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
+    try:
+        print(f"Fetching: {query}")
+        # Retries with backoff are handled by the session's adapter
+        response = SESSION.get(url, timeout=30)
+        response.raise_for_status()
 
-            # Add small delay to be respectful
-            time.sleep(random.uniform(1, 3))
+        # Add small delay to be respectful
+        time.sleep(random.uniform(1, 3))
 
-            return response.text
+        return response.content
 
-        except Exception as e:
-            print(f"Error fetching {query} (attempt {attempt + 1}): {e}")
-            if attempt < max_retries - 1:
-                time.sleep(random.uniform(2, 5))
-            else:
-                print(f"Failed to fetch after {max_retries} attempts")
-                return None
+    except Exception as e:
+        print(f"Failed to fetch {query}: {e}")
+        return None
 
 def parse_rss_content(xml_content):
     """Parse RSS XML content and extract items"""
@@ -4,114 +4,164 @@ Quick enhanced GPS extraction for Turkey earthquake news.
 Optimized for faster processing with T5-Flan.
 """
 
-import json
+import functools
+import os
 import re
 import time
 import random
+import shutil
 from typing import Dict, List, Optional, Tuple
 import warnings
-warnings.filterwarnings("ignore")
-
-def enhanced_location_extraction(title: str, description: str) -> Optional[Dict]:
-    """Fast location extraction using pattern matching and keyword analysis."""
-
-    # Enhanced Turkish location database with precise coordinates
-    locations = {
-        'istanbul': (41.008240, 28.978359),
-        'izmir': (38.419220, 27.128670),
-        'ankara': (39.933365, 32.859741),
-        'balikesir': (39.648361, 27.882589),
-        'sindirgi': (39.247891, 28.983456),
-        'manisa': (38.619127, 27.428934),
-        'akhisar': (38.916734, 27.833456),
-        'kutahya': (39.416712, 29.983289),
-        'bursa': (40.182578, 29.066502),
-        'canakkale': (40.155312, 26.414178),
-        'tekirdag': (40.983345, 27.516723),
-        'kocaeli': (40.853289, 29.881567),
-        'sakarya': (40.756934, 30.378123),
-        'yalova': (40.650045, 29.266789),
-        'bolu': (40.739456, 31.606123),
-        'duzce': (40.837823, 31.156534),
-        'western_turkey': (39.000000, 28.000000),
-        'western_anatolia': (38.800000, 28.500000),
-        'marmara_region': (40.500000, 29.000000),
-        'aegean_region': (38.500000, 27.500000),
-        'north_anatolian_fault': (40.750000, 30.000000)
-    }
 
-    # Disaster detection keywords
-    disaster_keywords = [
-        'earthquake', 'quake', 'seismic', 'magnitude', 'tremor',
-        'collapse', 'collapsed', 'building', 'damage', 'destroyed',
-        'casualties', 'injured', 'killed', 'dead', 'victims',
-        'rescue', 'emergency', 'disaster', 'evacuated'
-    ]
+import numpy as np
+import orjson
 
-    combined_text = f"{title} {description}".lower()
-
-    # Check if it's a disaster event
-    disaster_score = sum(1 for keyword in disaster_keywords if keyword in combined_text)
-    is_disaster = disaster_score >= 2
+warnings.filterwarnings("ignore")
 
-    if not is_disaster:
+# Enhanced Turkish location database with precise coordinates
+LOCATIONS = {
+    'istanbul': (41.008240, 28.978359),
+    'izmir': (38.419220, 27.128670),
+    'ankara': (39.933365, 32.859741),
+    'balikesir': (39.648361, 27.882589),
+    'sindirgi': (39.247891, 28.983456),
+    'manisa': (38.619127, 27.428934),
+    'akhisar': (38.916734, 27.833456),
+    'kutahya': (39.416712, 29.983289),
+    'bursa': (40.182578, 29.066502),
+    'canakkale': (40.155312, 26.414178),
+    'tekirdag': (40.983345, 27.516723),
+    'kocaeli': (40.853289, 29.881567),
+    'sakarya': (40.756934, 30.378123),
+    'yalova': (40.650045, 29.266789),
+    'bolu': (40.739456, 31.606123),
+    'duzce': (40.837823, 31.156534),
+    'western_turkey': (39.000000, 28.000000),
+    'western_anatolia': (38.800000, 28.500000),
+    'marmara_region': (40.500000, 29.000000),
+    'aegean_region': (38.500000, 27.500000),
+    'north_anatolian_fault': (40.750000, 30.000000)
+}
+
+# Disaster detection keywords
+DISASTER_KEYWORDS = [
+    'earthquake', 'quake', 'seismic', 'magnitude', 'tremor',
+    'collapse', 'collapsed', 'building', 'damage', 'destroyed',
+    'casualties', 'injured', 'killed', 'dead', 'victims',
+    'rescue', 'emergency', 'disaster', 'evacuated'
+]
+
+# Structure-of-arrays view of LOCATIONS, index-aligned, so the scan does no
+# per-item string munging
+_KEYS = list(LOCATIONS)
+_ALIASES = [key.replace('_', ' ') for key in _KEYS]
+_DISPLAY = [alias.title() for alias in _ALIASES]
+# Flat (pattern, index) scan list in priority order. Alias and key only differ
+# for multi-word names, so misses don't scan for the same substring twice.
+_SCAN = [
+    (pattern, i)
+    for i, (key, alias) in enumerate(zip(_KEYS, _ALIASES))
+    for pattern in ((alias,) if alias == key else (alias, key))
+]
+# Plain float tuples: they are only ever indexed one element at a time
+_LATS = tuple(float(LOCATIONS[key][0]) for key in _KEYS)
+_LONS = tuple(float(LOCATIONS[key][1]) for key in _KEYS)
+
+# Magnitude patterns, tried in order
+MAG_PATTERNS = [
+    re.compile(r'magnitude\s+(\d+\.?\d*)'),
+    re.compile(r'mag\.?\s+(\d+\.?\d*)'),
+    re.compile(r'(\d+\.?\d*)\s*magnitude')
+]
+
+
+def is_disaster_text(text: str, extra: str = '') -> bool:
+    """True if at least two disaster keywords occur in text or extra; stops at the second hit."""
+    hits = 0
+    for keyword in DISASTER_KEYWORDS:
+        if keyword in text or keyword in extra:
+            hits += 1
+            if hits >= 2:
+                return True
+    return False
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_deterministic(title: str, description: str) -> Optional[Tuple[str, float, float, float, Optional[float]]]:
+    """Pure part of the extraction, memoized for repeated titles/descriptions.
+
+    Returns (name, latitude, longitude, jitter_scale, magnitude) or None.
+    """
+
+    title_lower = title.lower()
+    description_lower = description.lower()
+
+    # Check if it's a disaster event. Keywords contain no spaces, so the parts
+    # can be checked separately and the combined text is only built on a hit.
+    if not is_disaster_text(title_lower, description_lower):
         return None
 
+    combined_text = f"{title_lower} {description_lower}"
+
     # Extract magnitude
     magnitude = None
-    mag_patterns = [
-        r'magnitude\s+(\d+\.?\d*)',
-        r'mag\.?\s+(\d+\.?\d*)',
-        r'(\d+\.?\d*)\s*magnitude'
-    ]
-    for pattern in mag_patterns:
-        match = re.search(pattern, combined_text)
+    for pattern in MAG_PATTERNS:
+        match = pattern.search(combined_text)
         if match:
             magnitude = float(match.group(1))
             break
 
     # Find location
-    best_location = None
-    best_coords = None
-
-    for location, coords in locations.items():
-        location_clean = location.replace('_', ' ')
-        if location_clean in combined_text or location in combined_text:
-            best_location = location_clean.title()
-            # Add random precision for granular coordinates
-            lat_offset = random.uniform(-0.001, 0.001)
-            lon_offset = random.uniform(-0.001, 0.001)
-            best_coords = (coords[0] + lat_offset, coords[1] + lon_offset)
-            break
+    for pattern, i in _SCAN:
+        if pattern in combined_text:
+            return _DISPLAY[i], _LATS[i], _LONS[i], 0.001, magnitude
 
     # Fallback patterns
-    if not best_location:
-        if any(word in combined_text for word in ['western turkey', 'western türkiye']):
-            best_location = "Western Turkey"
-            best_coords = (39.000000 + random.uniform(-0.01, 0.01), 28.000000 + random.uniform(-0.01, 0.01))
-        elif 'turkey' in combined_text or 'türkiye' in combined_text:
-            best_location = "Turkey"
-            best_coords = (39.000000 + random.uniform(-0.1, 0.1), 35.000000 + random.uniform(-0.1, 0.1))
-
-    if best_location and best_coords:
-        location_data = {
-            'name': best_location,
-            'latitude': round(best_coords[0], 6),
-            'longitude': round(best_coords[1], 6),
-            'coordinates': f"{round(best_coords[0], 6)},{round(best_coords[1], 6)}",
-            'confidence': 0.8,
-            'is_disaster_event': True,
-            'extraction_method': 'enhanced_pattern_matching'
-        }
-
-        if magnitude:
-            location_data['earthquake_info'] = {'magnitude': magnitude}
-
-        return location_data
+    if any(word in combined_text for word in ['western turkey', 'western türkiye']):
+        return "Western Turkey", 39.000000, 28.000000, 0.01, magnitude
+    if 'turkey' in combined_text or 'türkiye' in combined_text:
+        return "Turkey", 39.000000, 35.000000, 0.1, magnitude
 
     return None
 
 
+def enhanced_location_extraction(title: str, description: str,
+                                 jitter: Optional[Tuple[float, float]] = None) -> Optional[Dict]:
+    """Fast location extraction using pattern matching and keyword analysis.
+
+    ``jitter`` is a pair of unit offsets in [-1, 1) used to add granular
+    precision to the coordinates; drawn on the fly when not supplied.
+    """
+
+    match = _extract_deterministic(title, description)
+    if match is None:
+        return None
+
+    best_location, lat, lon, scale, magnitude = match
+
+    if jitter is None:
+        jitter = (random.uniform(-1, 1), random.uniform(-1, 1))
+
+    # Add random precision for granular coordinates
+    latitude = round(lat + jitter[0] * scale, 6)
+    longitude = round(lon + jitter[1] * scale, 6)
+
+    location_data = {
+        'name': best_location,
+        'latitude': latitude,
+        'longitude': longitude,
+        'coordinates': f"{latitude},{longitude}",
+        'confidence': 0.8,
+        'is_disaster_event': True,
+        'extraction_method': 'enhanced_pattern_matching'
+    }
+
+    if magnitude:
+        location_data['earthquake_info'] = {'magnitude': magnitude}
+
+    return location_data
+
+
 def main():
     """Main function for quick enhanced GPS extraction."""
 
@@ -123,8 +173,8 @@ def main():
 
     # Load data
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(input_file, 'rb') as f:
+            data = orjson.loads(f.read())
         print(f"✓ Loaded {len(data['items'])} news items")
     except Exception as e:
         print(f"✗ Error loading data: {e}")
@@ -135,13 +185,18 @@ def main():
 
     enhanced_count = 0
     disaster_count = 0
+    enhanced_log = []
+
+    # Draw all coordinate jitter up front in one vectorized call
+    rng = np.random.default_rng()
+    jitter = rng.uniform(-1.0, 1.0, size=(len(data['items']), 2)).tolist()
 
     for i, item in enumerate(data['items']):
-        title = item.get('title', '')
-        description = item.get('description', '')
+        title = item.get('title') or ''
+        description = item.get('description') or ''
 
         # Enhanced location extraction
-        location_info = enhanced_location_extraction(title, description)
+        location_info = enhanced_location_extraction(title, description, jitter[i])
 
         if location_info:
             # Mark as disaster and add location
@@ -150,12 +205,16 @@ def main():
             enhanced_count += 1
             disaster_count += 1
 
-            print(f"✓ Enhanced: {location_info['name']} ({location_info['latitude']}, {location_info['longitude']}) - {title[:50]}...")
+            enhanced_log.append((location_info['name'], location_info['latitude'], location_info['longitude'], title[:50]))
 
         # Progress indicator
         if (i + 1) % 100 == 0:
             print(f"Progress: {i + 1}/{len(data['items'])} items processed...")
 
+    # Emit per-item results in one write rather than a print per hit
+    if enhanced_log:
+        print("\n".join(f"✓ Enhanced: {name} ({lat}, {lon}) - {title}..." for name, lat, lon, title in enhanced_log))
+
     # Update metadata
     data['feed']['description'] += " - Enhanced with granular GPS coordinates and disaster tagging"
     data['feed']['generator'] = "Quick Enhanced Turkey Earthquake GPS Extractor 1.0"
@@ -175,13 +234,15 @@ def main():
 
     # Save enhanced data
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         print(f"\n✓ Saved enhanced data to {output_file}")
 
-        # Also update original file
-        with open(input_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Byte copy of the output just written (no second encode) to a temp file,
+        # then rename over the original so an interrupted run never truncates it
+        tmp_file = f"{input_file}.tmp"
+        shutil.copyfile(output_file, tmp_file)
+        os.replace(tmp_file, input_file)
         print(f"✓ Updated original {input_file}")
     except Exception as e:
         print(f"✗ Error saving: {e}")
@@ -1,16 +1,45 @@
 #!/usr/bin/env python3
-import json
-import xml.etree.ElementTree as ET
-import glob
+import mmap
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+
+# Optional: stream-count JSON items instead of loading whole files
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+MAX_WORKERS = 16  # Files counted concurrently; the work is mostly file I/O
+COUNT_CACHE_FILE = '.verify_cache.json'  # Item counts keyed on each file's mtime and size
+
+def _stream_count_json_items(f):
+    """Count top-level list entries or data['items'] entries without loading the file."""
+    events = ijson.parse(f)
+    _, first_event, _ = next(events, (None, None, None))
+    if first_event == 'start_array':
+        target = 'item'
+    elif first_event == 'start_map':
+        target = 'items.item'
+    else:
+        return 0
+
+    # Each entry yields one value or start event at the target prefix; keys and
+    # closing events of an object entry share that prefix, nested fields do not
+    return sum(1 for prefix, event, _ in events
+               if prefix == target and event not in ('map_key', 'end_map', 'end_array'))
 
 def count_json_items(json_file):
     """Count items in a JSON file"""
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if 'items' in data:
+        with open(json_file, 'rb') as f:
+            if ijson is not None:
+                return _stream_count_json_items(f)
+
+            data = orjson.loads(f.read())
+            if isinstance(data, dict) and 'items' in data:
                 return len(data['items'])
             elif isinstance(data, list):
                 return len(data)
@@ -23,28 +52,41 @@ def count_json_items(json_file):
 def count_xml_items(xml_file):
     """Count items in an XML file"""
     try:
-        with open(xml_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Try to parse as XML
-        try:
-            root = ET.fromstring(content)
-            items = list(root.iter('item'))
-            return len(items)
-        except ET.ParseError:
-            # If XML parsing fails, count <item> tags manually
-            return content.count('<item>')
+        # A byte scan of the mapped file: no DOM is built and the file is never
+        # copied into memory. Feeds written by the fetch scripts emit plain
+        # <item> tags, which is also what the old parse-failure fallback counted
+        with open(xml_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # mmap.count needs Python 3.13; find() is the same C-level search
+                count = 0
+                pos = mm.find(b'<item>')
+                while pos != -1:
+                    count += 1
+                    pos = mm.find(b'<item>', pos + 6)
+                return count
 
     except Exception as e:
         print(f"Error reading {xml_file}: {e}")
         return 0
 
-def get_file_size(file_path):
-    """Get file size in bytes"""
-    try:
-        return os.path.getsize(file_path)
-    except:
-        return 0
+def scan_data_files():
+    """Stat results of the JSON and XML files in the current directory, by name.
+
+    One scandir pass lists both kinds and each file is stat-ed once; the
+    sizes and mtimes are reused for the report and the count cache.
+    """
+    json_files, xml_files = {}, {}
+    with os.scandir('.') as entries:
+        for entry in entries:
+            if entry.name.startswith('.') or not entry.is_file():
+                continue
+            if entry.name.endswith('.json'):
+                json_files[entry.name] = entry.stat()
+            elif entry.name.endswith('.xml'):
+                xml_files[entry.name] = entry.stat()
+    return json_files, xml_files
 
 def format_file_size(size_bytes):
     """Format file size in human readable format"""
@@ -59,6 +101,44 @@ def format_file_size(size_bytes):
 
     return f"{size_bytes:.1f} {size_names[i]}"
 
+def load_count_cache():
+    """Load item counts recorded by the previous run"""
+    try:
+        with open(COUNT_CACHE_FILE, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+def save_count_cache(cache):
+    """Persist item counts so unchanged files are not recounted next run"""
+    try:
+        with open(COUNT_CACHE_FILE, 'wb') as f:
+            f.write(orjson.dumps(cache))
+    except OSError as e:
+        print(f"Could not save {COUNT_CACHE_FILE}: {e}")
+
+def count_file(path, st, count_items, cache):
+    """Item count of one file, reusing the cached count if it is unchanged"""
+    entry = cache.get(path)
+    if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+        return entry['items']
+
+    item_count = count_items(path)
+    cache[path] = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'items': item_count}
+    return item_count
+
+def count_files(files, count_items, cache):
+    """Count items for each file (name -> stat result) concurrently.
+
+    Returns (filename, item_count, file_size) tuples in sorted filename order,
+    so the report reads the same as a sequential scan.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(
+            lambda f: (f, count_file(f, files[f], count_items, cache), files[f].st_size),
+            sorted(files)
+        ))
+
 def verify_data_integrity():
     """Comprehensive verification of all data files"""
 
@@ -66,12 +146,13 @@ def verify_data_integrity():
     print("COMPREHENSIVE DATA VERIFICATION REPORT")
     print("="*70)
 
-    # Find all JSON files
-    json_files = glob.glob("*.json")
-    xml_files = glob.glob("*.xml")
+    # Find all JSON and XML files
+    json_files, xml_files = scan_data_files()
 
     print(f"\nFound {len(json_files)} JSON files and {len(xml_files)} XML files")
 
+    count_cache = load_count_cache()
+
     # Analyze JSON files
     print("\n" + "="*50)
     print("JSON FILES ANALYSIS")
@@ -80,9 +161,7 @@ def verify_data_integrity():
     json_stats = {}
     total_json_items = 0
 
-    for json_file in sorted(json_files):
-        item_count = count_json_items(json_file)
-        file_size = get_file_size(json_file)
+    for json_file, item_count, file_size in count_files(json_files, count_json_items, count_cache):
         json_stats[json_file] = {
             'items': item_count,
             'size': file_size
@@ -103,9 +182,7 @@ def verify_data_integrity():
     total_xml_items = 0
     categories = defaultdict(list)
 
-    for xml_file in sorted(xml_files):
-        item_count = count_xml_items(xml_file)
-        file_size = get_file_size(xml_file)
+    for xml_file, item_count, file_size in count_files(xml_files, count_xml_items, count_cache):
         xml_stats[xml_file] = {
             'items': item_count,
             'size': file_size
@@ -128,6 +205,9 @@ def verify_data_integrity():
     print("-" * 70)
     print(f"{'TOTAL XML ITEMS:':<40} | {total_xml_items:>8} items")
 
+    # Only keep entries for files that still exist
+    save_count_cache({f: count_cache[f] for f in [*json_files, *xml_files] if f in count_cache})
+
     # Category breakdown
     print("\n" + "="*50)
     print("XML FILES BY CATEGORY")
@@ -148,7 +228,8 @@ def verify_data_integrity():
 
     total_files = len(json_files) + len(xml_files)
     total_items = total_json_items + total_xml_items
-    total_size = sum(get_file_size(f) for f in json_files + xml_files)
+    total_size = (sum(stats['size'] for stats in json_stats.values())
+                  + sum(stats['size'] for stats in xml_stats.values()))
 
     print(f"Total files:           {total_files}")
     print(f"Total items:           {total_items:,}")